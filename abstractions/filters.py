@@ -16,19 +16,22 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import abc
-from aenum import AutoNumberEnum
-from typing import Dict, Optional
+import numpy as np
+from enum import IntEnum, auto
+from typing import Optional
 from PyQt5.QtGui import QColor
 
 
-class Filters(AutoNumberEnum):
-    SKIP_CERTIFIED_IMAGES = ()
-    HARD_EXAMPLE = ()
-    LAYER = ()
-    LAYER_HAS_MASK = ()
-    LAYER_NO_MASK = ()
-    LAYER_CERTIFIED = ()
-    LAYER_NOT_CERTIFIED = ()
+class Filters(IntEnum):
+    """IntEnum: comparisons and hashing in hot dispatch paths are C-level int operations."""
+
+    SKIP_CERTIFIED_IMAGES = auto()
+    HARD_EXAMPLE = auto()
+    LAYER = auto()
+    LAYER_HAS_MASK = auto()
+    LAYER_NO_MASK = auto()
+    LAYER_CERTIFIED = auto()
+    LAYER_NOT_CERTIFIED = auto()
 
 
 class FilterSubject(abc.ABC):
@@ -54,8 +57,8 @@ class FilterSubject(abc.ABC):
 
     @property
     @abc.abstractmethod
-    def images(self) -> Dict[int, bool]:
-        """Matched images for the observer."""
+    def images(self) -> np.ndarray:
+        """Matched images for the observer, a bool flag per image index."""
         pass
 
 
@@ -64,7 +67,12 @@ class FilterObserver(abc.ABC):
 
     @abc.abstractmethod
     def images_update(self, subject: FilterSubject) -> None:
-        """Observer's handler for updates of filter's matched images."""
+        """Observer's handler for updates of filter's matched images.
+
+        Several filters may fire back-to-back while their caches rebuild; observers
+        are allowed to coalesce the resulting redraws into one, so callers must not
+        rely on a visible refresh per call.
+        """
         pass
 
     @abc.abstractmethod
@@ -16,8 +16,9 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import abc
+import numpy as np
+from enum import IntEnum, auto
 from typing import List, Optional, Dict
-from aenum import AutoNumberEnum
 
 
 class MainWindowSubject(abc.ABC):
@@ -53,14 +54,30 @@ class MainWindowSubject(abc.ABC):
     def layers_certified(self) -> Dict[str, bool]:
         pass
 
+    @property
+    @abc.abstractmethod
+    def layers_has_mask_bits(self) -> np.ndarray:
+        """layers_has_mask as a layer-index-aligned bool array."""
+        pass
+
+    @property
+    @abc.abstractmethod
+    def layers_certified_bits(self) -> np.ndarray:
+        """layers_certified as a layer-index-aligned bool array."""
+        pass
+
 
-class MainWindowUpdate(AutoNumberEnum):
-    MASK = ()
-    CERTIFIED = ()
-    HARD_EXAMPLE = ()
+class MainWindowUpdate(IntEnum):
+    MASK = auto()
+    CERTIFIED = auto()
+    HARD_EXAMPLE = auto()
 
 
 class MainWindowObserverArgs:
+    """One instance is allocated per update event; __slots__ keeps that allocation small."""
+
+    __slots__ = ("_update_type", "_index", "_layer")
+
     def __init__(self, update_type: MainWindowUpdate, index: int, layer: Optional[str] = None):
         self._update_type: MainWindowUpdate = update_type
         self._index: int = index
@@ -37,10 +37,15 @@ class CheckboxDialog(QDialog):
         ok = QPushButton(text="Ok")
         buttons.addWidget(ok)
 
+        """Item texts are known up front; keeping them beside the checkboxes saves a
+        Qt text() round trip per checkbox when the selection is read back."""
+        self._items = []
+
         for item in items:
             qcb = QCheckBox(item)
             checks.addWidget(qcb)
             self.checks.append(qcb)
+            self._items.append(item)
 
         cancel.clicked.connect(self.on_cancel)
         ok.clicked.connect(self.on_ok)
@@ -56,7 +61,7 @@ class CheckboxDialog(QDialog):
         return self.result
 
     def on_ok(self):
-        self.result = [x.text() for x in self.checks if x.isChecked()]
+        self.result = [item for item, x in zip(self._items, self.checks) if x.isChecked()]
         self.done(0)
 
     def on_cancel(self):
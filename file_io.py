@@ -0,0 +1,220 @@
+# Copyright (c) 2020 Maka Autonomous Robotic Systems, Inc.
+#
+# This file is part of Makannotations.
+#
+# Makannotations is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Makannotations is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import concurrent.futures
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+S3_PREFIX = "s3://"
+
+# Filters re-probe the same files on every mode change; short-lived caches turn
+# those repeats into dict lookups.  Entries are dropped on write_file/delete_file.
+_CACHE_TTL = 30.0
+_READ_CACHE_SIZE = 32
+
+_exists_cache: Dict[str, Tuple[float, bool]] = {}
+_read_cache: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+
+
+def _invalidate(path):
+    _exists_cache.pop(path, None)
+    _read_cache.pop(path, None)
+
+
+_S3_CLIENT = None
+
+
+def _s3_client():
+    """Client construction (session + signer setup) is expensive; build it once and reuse."""
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        _S3_CLIENT = boto3.client("s3")
+    return _S3_CLIENT
+
+
+def _split_s3_path(path):
+    return path[len(S3_PREFIX) :].split("/", 1)
+
+
+# A single GET/PUT is capped by one connection's TCP throughput; objects above this
+# size are transferred as parallel ranged GETs / multipart uploads instead.
+_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+_TRANSFER_WORKERS = 8
+
+_transfer_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _transfers():
+    global _transfer_executor
+    if _transfer_executor is None:
+        _transfer_executor = concurrent.futures.ThreadPoolExecutor(max_workers=_TRANSFER_WORKERS)
+    return _transfer_executor
+
+
+def _ranged_get(bucket, key, size):
+    buffer = bytearray(size)
+    chunk = (size + _TRANSFER_WORKERS - 1) // _TRANSFER_WORKERS
+
+    def fetch_range(start):
+        end = min(start + chunk, size) - 1
+        body = _s3_client().get_object(Bucket=bucket, Key=key, Range="bytes={}-{}".format(start, end))["Body"]
+        buffer[start : end + 1] = body.read()
+
+    futures = [_transfers().submit(fetch_range, start) for start in range(0, size, chunk)]
+    for future in futures:
+        future.result()
+    return bytes(buffer)
+
+
+def _multipart_put(bucket, key, data):
+    upload = _s3_client().create_multipart_upload(Bucket=bucket, Key=key)
+
+    def upload_part(number, start):
+        part = _s3_client().upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload["UploadId"],
+            PartNumber=number,
+            Body=data[start : start + _MULTIPART_PART_SIZE],
+        )
+        return {"PartNumber": number, "ETag": part["ETag"]}
+
+    try:
+        futures = [
+            _transfers().submit(upload_part, number, start)
+            for number, start in enumerate(range(0, len(data), _MULTIPART_PART_SIZE), start=1)
+        ]
+        parts = [future.result() for future in futures]
+        _s3_client().complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload["UploadId"], MultipartUpload={"Parts": parts}
+        )
+    except Exception:
+        _s3_client().abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload["UploadId"])
+        raise
+
+
+def list_keys(path):
+    """
+    Return the set of full paths of all files under path.
+    One listing plus membership checks is much cheaper than probing files one by one:
+    a single paginated ListObjectsV2 request on S3, a single scandir on a local directory.
+    """
+    if path.startswith(S3_PREFIX):
+        bucket, prefix = _split_s3_path(path)
+        keys = set()
+        paginator = _s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                keys.add(S3_PREFIX + bucket + "/" + obj["Key"])
+        return keys
+
+    if not os.path.isdir(path):
+        return set()
+    with os.scandir(path) as entries:
+        return {entry.path for entry in entries if entry.is_file()}
+
+
+def file_exists(path):
+    cached = _exists_cache.get(path)
+    if cached is not None and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+
+    exists = _probe_file_exists(path)
+    _exists_cache[path] = (time.monotonic(), exists)
+    return exists
+
+
+def _probe_file_exists(path):
+    if path.startswith(S3_PREFIX):
+        bucket, key = _split_s3_path(path)
+        try:
+            _s3_client().head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response["ResponseMetadata"]["HTTPStatusCode"] == 404:
+                return False
+            raise
+        return True
+
+    return os.path.isfile(path)
+
+
+def read_file(path):
+    """Return the file's bytes, None if it doesn't exist."""
+    data = _read_cache.get(path)
+    if data is not None:
+        _read_cache.move_to_end(path)
+        return data
+
+    data = _fetch_file(path)
+    if data is not None:
+        _read_cache[path] = data
+        if len(_read_cache) > _READ_CACHE_SIZE:
+            _read_cache.popitem(last=False)
+    return data
+
+
+def _fetch_file(path):
+    if path.startswith(S3_PREFIX):
+        bucket, key = _split_s3_path(path)
+        try:
+            size = _s3_client().head_object(Bucket=bucket, Key=key)["ContentLength"]
+            if size > _MULTIPART_THRESHOLD:
+                return _ranged_get(bucket, key, size)
+            return _s3_client().get_object(Bucket=bucket, Key=key)["Body"].read()
+        except ClientError as e:
+            if e.response["ResponseMetadata"]["HTTPStatusCode"] == 404:
+                return None
+            raise
+
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_file(path, data):
+    _invalidate(path)
+    if path.startswith(S3_PREFIX):
+        bucket, key = _split_s3_path(path)
+        if len(data) > _MULTIPART_THRESHOLD:
+            _multipart_put(bucket, key, data)
+        else:
+            _s3_client().put_object(Bucket=bucket, Key=key, Body=data)
+        return
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def delete_file(path):
+    _invalidate(path)
+    if path.startswith(S3_PREFIX):
+        bucket, key = _split_s3_path(path)
+        _s3_client().delete_object(Bucket=bucket, Key=key)
+        return
+
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
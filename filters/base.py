@@ -16,6 +16,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import abc
+import numpy as np
 from typing import Optional
 from PyQt5.QtGui import QColor
 from abstractions.main_window import MainWindowObserver
@@ -61,3 +62,8 @@ class Filter(FilterSubject, MainWindowObserver, abc.ABC):
     @abc.abstractmethod
     def skip_image(self, index: int) -> bool:
         pass
+
+    @abc.abstractmethod
+    def skip_mask(self) -> Optional[np.ndarray]:
+        """Skip flags for all images at once, None if the filter doesn't restrict anything."""
+        pass
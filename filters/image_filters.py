@@ -17,8 +17,11 @@
 
 from PyQt5.QtGui import QColor
 import abc
+import functools
+import numpy as np
+import file_io
 from image_canvas import ImageCanvas
-from typing import Dict, List, Callable
+from typing import List, Callable, Optional, Union
 from abstractions.filters import Filters, FilterObserver
 from abstractions.main_window import MainWindowSubject, MainWindowObserverArgs, MainWindowUpdate
 from filters.base import Filter, color_opacity
@@ -31,29 +34,32 @@ class ImageFilter(Filter, abc.ABC):
 
     def __init__(self, observer: FilterObserver):
         super().__init__(observer)
-        """self._images: {image_index: value}"""
-        self._images: Dict[int, bool] = {}
+        """self._images: one bool flag per image index (1 byte each, instead of a dict slot per image)."""
+        self._images: np.ndarray = np.zeros(0, dtype=np.bool_)
 
     @property
-    def images(self) -> Dict[int, bool]:
+    def images(self) -> np.ndarray:
         return self._images
 
-    def _set_images(self, images: List[str], get_image_value: Callable[[str], bool]) -> None:
-        self._images.clear()
-        for index in range(len(images)):
-            self._images[index] = get_image_value(images[index])
+    def _set_images(self, images: List[str], get_image_value: Union[Callable[[str], bool], functools.partial]) -> None:
+        self._images = np.fromiter((get_image_value(image) for image in images), dtype=np.bool_, count=len(images))
 
         self._observer.images_update(self)
 
     def _update_image_value(self, index: int, value: bool) -> None:
         self._images[index] = value
-        self._observer.image_update(self, index, self._images[index])
+        self._observer.image_update(self, index, value)
 
     def skip_image(self, index: int) -> bool:
         if self._active and not self._images[index]:
             return True
         return False
 
+    def skip_mask(self) -> Optional[np.ndarray]:
+        if not self._active or self._images.size == 0:
+            return None
+        return np.logical_not(self._images)
+
 
 class SkipCertifiedImagesFilter(ImageFilter):
     NAME: Filters = Filters.SKIP_CERTIFIED_IMAGES
@@ -61,18 +67,21 @@ class SkipCertifiedImagesFilter(ImageFilter):
     COLOR: QColor = QColor(0, 255, 0, color_opacity)
 
     def set_images(self, subject: MainWindowSubject) -> None:
-        def get_image_value(image: str):
-            return ImageCanvas.image_has_unncertified_layers(subject.images_path, image, subject.layers)
-
-        self._set_images(subject.images, get_image_value)
+        existing_files = file_io.list_keys(subject.images_path)
+        self._set_images(
+            subject.images,
+            functools.partial(
+                ImageCanvas.image_has_unncertified_layers,
+                subject.images_path,
+                layers=subject.layers,
+                existing_files=existing_files,
+            ),
+        )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs) -> None:
-        if args.update_type in [MainWindowUpdate.MASK, MainWindowUpdate.CERTIFIED]:
-            image_value: bool = any(
-                [
-                    (not certified and has_mask)
-                    for certified, has_mask in zip(subject.layers_certified.values(), subject.layers_has_mask.values())
-                ]
+        if args.update_type == MainWindowUpdate.MASK or args.update_type == MainWindowUpdate.CERTIFIED:
+            image_value = bool(
+                np.any(np.logical_and(subject.layers_has_mask_bits, np.logical_not(subject.layers_certified_bits)))
             )
             self._update_image_value(args.index, image_value)
 
@@ -83,10 +92,16 @@ class HardExampleFilter(ImageFilter):
     COLOR: QColor = QColor(123, 0, 180, color_opacity)
 
     def set_images(self, subject: MainWindowSubject) -> None:
-        def get_image_value(image: str):
-            return ImageCanvas.image_has_hard_example(subject.images_path, image, subject.layers)
-
-        self._set_images(subject.images, get_image_value)
+        existing_files = file_io.list_keys(subject.images_path)
+        self._set_images(
+            subject.images,
+            functools.partial(
+                ImageCanvas.image_has_hard_example,
+                subject.images_path,
+                layers=subject.layers,
+                existing_files=existing_files,
+            ),
+        )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs) -> None:
         if args.update_type == MainWindowUpdate.HARD_EXAMPLE:
@@ -17,13 +17,36 @@
 
 from PyQt5.QtGui import QColor
 import abc
+import concurrent.futures
 import functools
+import numpy as np
+import file_io
 from image_canvas import ImageCanvas
 from typing import Dict, List, Callable, Union, Optional
 from abstractions.main_window import MainWindowSubject, MainWindowUpdate, MainWindowObserverArgs
 from abstractions.filters import FilterObserver, Filters
 from filters.base import Filter, color_opacity
 
+"""Probes are I/O-bound; below this many (layer, image) pairs the executor overhead isn't worth it."""
+PARALLEL_PROBES_THRESHOLD = 64
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _probes_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=32)
+    return _executor
+
+
+def _not_layer_has_mask(images_path: str, image: str, layer: str, existing_files=None) -> bool:
+    return not ImageCanvas.layer_has_mask(images_path, image, layer, existing_files)
+
+
+def _not_layer_certified(images_path: str, image: str, layer: str, existing_files=None) -> bool:
+    return not ImageCanvas.layer_certified(images_path, image, layer, existing_files)
+
 
 class LayerFilter(Filter, abc.ABC):
     """
@@ -33,16 +56,17 @@ class LayerFilter(Filter, abc.ABC):
     def __init__(self, observer: FilterObserver):
         super().__init__(observer)
         """"
-        self._images: {layer: {image_index: value}}
-        Images data is stored for each layer.
+        self._images: {layer: flags}
+        One bool flag per image index is stored for each layer.
         """
-        self._images: Dict[str, Dict[int, bool]] = {}
+        self._images: Dict[str, np.ndarray] = {}
         self._active_layer: Optional[str] = None
 
     def set_active_layer(self, active_layer: str) -> None:
         """Observer gets notification about matched images update event every time active_layer is changed."""
         self._active_layer = active_layer
-        if self._images.get(self._active_layer):
+        images = self._images.get(self._active_layer)
+        if images is not None and images.size > 0:
             self._observer.images_update(self)
 
     @property
@@ -51,7 +75,7 @@ class LayerFilter(Filter, abc.ABC):
         return self._active_layer
 
     @property
-    def images(self) -> Dict[int, bool]:
+    def images(self) -> np.ndarray:
         """Images of active layer."""
         return self._images[self._active_layer]
 
@@ -63,9 +87,20 @@ class LayerFilter(Filter, abc.ABC):
     ) -> None:
         self._images.clear()
         for layer in layers:
-            self._images[layer]: Dict[int, bool] = {}
-            for index in range(len(images)):
-                self._images[layer][index] = get_image_value(images[index], layer)
+            self._images[layer] = np.zeros(len(images), dtype=np.bool_)
+
+        if len(layers) * len(images) < PARALLEL_PROBES_THRESHOLD:
+            for layer in layers:
+                for index in range(len(images)):
+                    self._images[layer][index] = get_image_value(images[index], layer)
+        else:
+            futures = {
+                (layer, index): _probes_executor().submit(get_image_value, images[index], layer)
+                for layer in layers
+                for index in range(len(images))
+            }
+            for (layer, index), future in futures.items():
+                self._images[layer][index] = future.result()
 
         self._observer.images_update(self)
 
@@ -79,6 +114,14 @@ class LayerFilter(Filter, abc.ABC):
             return True
         return False
 
+    def skip_mask(self) -> Optional[np.ndarray]:
+        if not self._active:
+            return None
+        images = self._images.get(self._active_layer)
+        if images is None or images.size == 0:
+            return None
+        return np.logical_not(images)
+
 
 class LayerHasMask(LayerFilter):
     NAME: Filters = Filters.LAYER_HAS_MASK
@@ -86,8 +129,11 @@ class LayerHasMask(LayerFilter):
     COLOR: QColor = QColor(255, 0, 0, color_opacity)
 
     def set_images(self, subject: MainWindowSubject) -> None:
+        existing_files = file_io.list_keys(subject.images_path)
         self._set_images(
-            subject.images, subject.layers, functools.partial(ImageCanvas.layer_has_mask, subject.images_path)
+            subject.images,
+            subject.layers,
+            functools.partial(ImageCanvas.layer_has_mask, subject.images_path, existing_files=existing_files),
         )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs) -> None:
@@ -101,10 +147,11 @@ class LayerHasNoMask(LayerFilter):
     COLOR: QColor = QColor(255, 255, 0, color_opacity)
 
     def set_images(self, subject: MainWindowSubject) -> None:
+        existing_files = file_io.list_keys(subject.images_path)
         self._set_images(
             subject.images,
             subject.layers,
-            lambda image, layer: not ImageCanvas.layer_has_mask(subject.images_path, image, layer),
+            functools.partial(_not_layer_has_mask, subject.images_path, existing_files=existing_files),
         )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs) -> None:
@@ -118,8 +165,11 @@ class LayerCertified(LayerFilter):
     COLOR = QColor(0, 0, 255, color_opacity)
 
     def set_images(self, subject: MainWindowSubject):
+        existing_files = file_io.list_keys(subject.images_path)
         self._set_images(
-            subject.images, subject.layers, functools.partial(ImageCanvas.layer_certified, subject.images_path)
+            subject.images,
+            subject.layers,
+            functools.partial(ImageCanvas.layer_certified, subject.images_path, existing_files=existing_files),
         )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs):
@@ -133,10 +183,11 @@ class LayerNotCertified(LayerFilter):
     COLOR: QColor = QColor(0, 255, 255, color_opacity)
 
     def set_images(self, subject: MainWindowSubject) -> None:
+        existing_files = file_io.list_keys(subject.images_path)
         self._set_images(
             subject.images,
             subject.layers,
-            lambda image, layer: not ImageCanvas.layer_certified(subject.images_path, image, layer),
+            functools.partial(_not_layer_certified, subject.images_path, existing_files=existing_files),
         )
 
     def update_image_value(self, subject: MainWindowSubject, args: MainWindowObserverArgs) -> None:
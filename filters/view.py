@@ -17,9 +17,10 @@
 
 from PyQt5.QtWidgets import QCheckBox, QComboBox, QWidget, QHBoxLayout, QLabel, QToolBar, QLayout
 from PyQt5.QtGui import QFont
+import numpy as np
 from typing import Dict, List, Optional, Union
 from abstractions.filters import Filters
-from abstractions.main_window import MainWindowSubject, MainWindowObserver, MainWindowObserverArgs
+from abstractions.main_window import MainWindowSubject, MainWindowObserver, MainWindowObserverArgs, MainWindowUpdate
 from filters.base import Filter
 
 
@@ -64,6 +65,9 @@ class FilterUI(MainWindowObserver):
     def skip_image(self, index: int) -> bool:
         return self.filter.skip_image(index)
 
+    def skip_mask(self) -> Optional[np.ndarray]:
+        return self.filter.skip_mask()
+
     def set_images(self, main_window: MainWindowSubject) -> None:
         self.filter.set_images(main_window)
 
@@ -93,6 +97,14 @@ class LayerFiltersUI(MainWindowObserver):
     it sends notification to it's observer about this event."
     """
 
+    """Update types each filter reacts to; updates are routed only to the filters that care."""
+    FILTER_UPDATE_TYPES: Dict[Filters, MainWindowUpdate] = {
+        Filters.LAYER_HAS_MASK: MainWindowUpdate.MASK,
+        Filters.LAYER_NO_MASK: MainWindowUpdate.MASK,
+        Filters.LAYER_CERTIFIED: MainWindowUpdate.CERTIFIED,
+        Filters.LAYER_NOT_CERTIFIED: MainWindowUpdate.CERTIFIED,
+    }
+
     def __init__(self, filters: List[LayerFilterUI]):
         super().__init__()
 
@@ -102,6 +114,18 @@ class LayerFiltersUI(MainWindowObserver):
         self._active_layer: Optional[str] = None
         self.filters_ui: List[LayerFilterUI] = filters
 
+        self._dispatch: Dict[MainWindowUpdate, List[LayerFilterUI]] = {update: [] for update in MainWindowUpdate}
+        for filter_ui in self.filters_ui:
+            update_type = LayerFiltersUI.FILTER_UPDATE_TYPES.get(filter_ui.name)
+            if update_type is not None:
+                self._dispatch[update_type].append(filter_ui)
+
+        """skip_image runs per image per repaint; only currently active filters are worth asking."""
+        self._active_filters: List[LayerFilterUI] = []
+
+    def _refresh_active_filters(self) -> None:
+        self._active_filters = [filter_ui for filter_ui in self.filters_ui if filter_ui.active]
+
     def set_layer_select(self, layers_select: QComboBox) -> None:
         self._layer_select = layers_select
         if self._active_layer is not None:
@@ -123,11 +147,17 @@ class LayerFiltersUI(MainWindowObserver):
             filter_ui.set_images(main_window)
 
     def update_image_value(self, main_window: MainWindowSubject, args: MainWindowObserverArgs) -> None:
-        for filter_ui in self.filters_ui:
+        for filter_ui in self._dispatch[args.update_type]:
             filter_ui.update_image_value(main_window, args)
 
     def skip_image(self, index: int) -> bool:
-        return any([filter_ui.skip_image(index) for filter_ui in self.filters_ui])
+        return any(filter_ui.skip_image(index) for filter_ui in self._active_filters)
+
+    def skip_mask(self) -> Optional[np.ndarray]:
+        masks = [mask for mask in (filter_ui.skip_mask() for filter_ui in self._active_filters) if mask is not None]
+        if not masks:
+            return None
+        return np.logical_or.reduce(masks)
 
     def display_filter(self, main_widget: QToolBar) -> None:
         main_widget.addWidget(self._layer_select)
@@ -140,6 +170,7 @@ class LayerFiltersUI(MainWindowObserver):
             layout.addWidget(label)
             for filter_ui in filters_ui:
                 filter_ui.display_filter(layout)
+                filter_ui.checkbox.stateChanged.connect(self._refresh_active_filters)
             toolbar.addWidget(widget)
 
         named_filters: Dict[Filters, LayerFilterUI] = LayerFiltersUI.filters_to_dict(self.filters_ui)
@@ -25,11 +25,11 @@ import datetime
 from aenum import AutoNumberEnum
 from typing import List
 from PyQt5.QtCore import QRect, QSize, Qt
-from PyQt5.QtGui import QColor, QCursor, QImage, QPainter, QPen, QPixmap
+from PyQt5.QtGui import QColor, QCursor, QImage, QPainter, QPen
 from PyQt5.QtWidgets import QLabel
 
 import torchscript_model
-from mask_image import MaskImage, DEFAULT_MASK_COLOR
+from mask_image import MaskImage, DEFAULT_MASK_COLOR, pack_mask
 from metadata import CertificationData, DEFAULT_CERTIFICATION_VERSION
 
 ZOOM_FACTOR = 0.1
@@ -49,7 +49,35 @@ DEFAULT_CLUSTERS_AMOUNT = 10
 SCROLL_PADDING = 2
 
 
+@functools.lru_cache(maxsize=64)
+def _load_mask_packed(label_file, mtime_ns):
+    """Decoded layer mask as (packed bits, shape), keyed on mtime so saves
+    naturally invalidate entries.
+
+    Show-all-layers redraws re-read every non-active layer's mask; caching the
+    decode turns repeat redraws into dict lookups.  Bit-packing keeps one bit
+    per pixel resident instead of one byte; compositing unpacks on demand.
+    """
+    mask = cv2.imread(label_file, cv2.IMREAD_GRAYSCALE)
+    if mask is None:
+        return None
+    # packbits binarizes nonzero bytes itself, so the 0/255 buffer feeds it
+    # without an intermediate bool view.
+    return pack_mask(mask), mask.shape
+
+
 class Settings:
+    __slots__ = (
+        "algo_stack",
+        "clusters_amount",
+        "removing_objects_size",
+        "closing_iterations_image",
+        "dilation_iterations",
+        "erosion_iterations",
+    )
+    # Explicit field list keeps serialization stable if private state is added.
+    _FIELDS = __slots__
+
     class Sliders(AutoNumberEnum):
         CLUSTERING = ()
         REMOVING_OBJECTS = ()
@@ -74,8 +102,7 @@ class Settings:
     @staticmethod
     def from_map(instance_map):
         obj = Settings()
-        variables = vars(obj).keys()
-        for var in variables:
+        for var in Settings._FIELDS:
             setattr(obj, var, instance_map.get(var, getattr(obj, var)))
         return obj
 
@@ -89,12 +116,10 @@ class Settings:
         self.erosion_iterations = DEFAULT_EROSION_ITERATIONS
 
     def __str__(self):
-        return "1: [{}, {}], 2: [{}, {}], 3: [{}, {}], " + "4: [{}, {}], 5: [{}, {}], 6: [{}, {}]".format(
-            *vars(self).values()
-        )
+        return ", ".join("{}: {}".format(field, getattr(self, field)) for field in self._FIELDS)
 
     def to_map(self):
-        return vars(self)
+        return {field: getattr(self, field) for field in self._FIELDS}
 
 
 class ImageCanvas(QLabel):
@@ -109,6 +134,25 @@ class ImageCanvas(QLabel):
         POLYGON_ERASER_MODE = ()
         POLYLINE_MODE = ()
 
+    # Drawing mode -> MaskImage.Action for the polyshape tools.
+    POLYSHAPE_ACTIONS = {
+        Drawing.POLYGON_DRAW_MODE: MaskImage.Action.POLYGON_DRAW_MODE,
+        Drawing.POLYGON_ERASER_MODE: MaskImage.Action.POLYGON_ERASER_MODE,
+        Drawing.POLYLINE_MODE: MaskImage.Action.POLYLINE_MODE,
+    }
+
+    # Brush cursor colors drawn in paintEvent.
+    BRUSH_CURSOR_COLORS = {
+        Drawing.ERASER_MODE: [255, 0, 0],
+        Drawing.DRAW_MODE: [64, 255, 64],
+        Drawing.SEED_MODE: [90, 180, 90],
+    }
+
+    # Modes whose edits are click-driven; mouse moves only refresh their preview.
+    CLICK_DRIVEN_MODES = frozenset(
+        {Drawing.POLYGON_DRAW_MODE, Drawing.POLYGON_ERASER_MODE, Drawing.POLYLINE_MODE, Drawing.FLOOD_FILL_MODE}
+    )
+
     def __init__(self, layer_has_mask_callback, scrol_widget):
         super().__init__(scrol_widget)
         self.scroll_widget = scrol_widget
@@ -127,10 +171,45 @@ class ImageCanvas(QLabel):
         self.mode = ImageCanvas.Drawing.NONE_MODE
         self.last_mode = ImageCanvas.Drawing.NONE_MODE
         self.moving_mask = False
+        # Jump tables for the per-mouse-event paths; cheaper and flatter than
+        # re-walking an if-ladder over self.mode on every move event.
+        self._button_handlers = {
+            ImageCanvas.Drawing.ERASER_MODE: self._handle_eraser_mode,
+            ImageCanvas.Drawing.DRAW_MODE: self._handle_draw_mode,
+            ImageCanvas.Drawing.BOX_MODE: self._begin_box,
+            ImageCanvas.Drawing.POLYGON_DRAW_MODE: self._handle_polyshape_mode,
+            ImageCanvas.Drawing.POLYGON_ERASER_MODE: self._handle_polyshape_mode,
+            ImageCanvas.Drawing.POLYLINE_MODE: self._handle_polyshape_mode,
+            ImageCanvas.Drawing.SEED_MODE: self._handle_seed_mode,
+            ImageCanvas.Drawing.FLOOD_FILL_MODE: self._handle_flood_fill_mode,
+        }
+        self._paint_overlays = {
+            ImageCanvas.Drawing.POLYGON_DRAW_MODE: self._paint_polyshape_overlay,
+            ImageCanvas.Drawing.POLYGON_ERASER_MODE: self._paint_polyshape_overlay,
+            ImageCanvas.Drawing.POLYLINE_MODE: self._paint_polyline_overlay,
+            ImageCanvas.Drawing.FLOOD_FILL_MODE: self._paint_flood_fill_overlay,
+        }
+        # Serialized algorithm name -> replay handler for saved algo stacks.
+        self._algo_dispatch = {
+            "Algorithm.AUTO_MASK_DL": self._replay_auto_mask_DL,
+            "Algorithm.LAB_AUTO_MASK": lambda value: self.lab_auto_mask(),
+            "Algorithm.CLUSTERING": self._replay_clustering,
+            "Algorithm.BRIGHT_AUTO_MASK": lambda value: self.bright_auto_mask(),
+            "Algorithm.DILATION": self._replay_dilation,
+            "Algorithm.EROSION": self._replay_erosion,
+            "Algorithm.REMOVING_OBJECTS": self._replay_removing_objects,
+            "Algorithm.CLOSING_ITERATIONS": self._replay_closing_iterations,
+        }
         self.app = None
         self.brush_zoom = 0
+        # Scale and brush radius are read several times per mouse event but only change
+        # on zoom/brush events; cache them instead of recomputing per call.
+        self._cached_scale = 1.0
+        self._cached_inv_scale = 1.0
+        self._cached_brush_radius = int(DEFAULT_BRUSH_RADIUS)
         self.layers = None
         self.layer = None
+        self._cert_paths = {}
         self.mode_to_btn = None
         # pixels per inch
         self.show_inch_grid = False
@@ -167,7 +246,10 @@ class ImageCanvas(QLabel):
 
         # visible region
         self.visible_rect = None
-        self.visible_pixmap = None
+        self.visible_image = None
+        self._display_keepalive = None
+        self._pixmap_key = None
+        self._last_cursor_key = None
         self.vis_region_x_start = None
         self.vis_region_x_end = None
         self.vis_region_y_start = None
@@ -181,6 +263,9 @@ class ImageCanvas(QLabel):
         self.destination_layer = None
 
         self.layer_has_mask_callback = layer_has_mask_callback
+        # One partial per layer name; rebuilding them on every image load just
+        # churned allocations for identical bindings.
+        self._layer_has_mask_partials = {}
 
         self.show_all_layers = False
         self.layers_colors = None
@@ -191,33 +276,39 @@ class ImageCanvas(QLabel):
         self.layers_hard_example = {}
 
         # original size image region of interest
-        self._normalized_image_roi: List[float] = [0, 0, 1, 1]
+        self._normalized_image_roi = np.array([0, 0, 1, 1], dtype=np.float32)
 
     @staticmethod
-    def image_has_unncertified_layers(path, image_filename, layers):
+    def image_has_unncertified_layers(path, image_filename, layers, existing_files=None):
         for layer in layers:
-            if not ImageCanvas.layer_certified(path, image_filename, layer) and ImageCanvas.layer_has_mask(
-                path, image_filename, layer
-            ):
+            if not ImageCanvas.layer_certified(
+                path, image_filename, layer, existing_files
+            ) and ImageCanvas.layer_has_mask(path, image_filename, layer, existing_files):
                 return True
         return False
 
     @staticmethod
-    def image_has_hard_example(path, image_filename, layers):
+    def image_has_hard_example(path, image_filename, layers, existing_files=None):
         for layer in layers:
             certification_filename = CertificationData.make_certification_filename(path, image_filename, layer)
+            if existing_files is not None and certification_filename not in existing_files:
+                continue
             if ImageCanvas.hard_example_status(certification_filename):
                 return True
         return False
 
     @staticmethod
-    def layer_certified(path, image_filename, layer):
+    def layer_certified(path, image_filename, layer, existing_files=None):
         certification_filename = CertificationData.make_certification_filename(path, image_filename, layer)
+        if existing_files is not None and certification_filename not in existing_files:
+            return False
         return ImageCanvas.certification_status(certification_filename)
 
     @staticmethod
-    def layer_has_mask(path, image_filename, layer):
+    def layer_has_mask(path, image_filename, layer, existing_files=None):
         mask_filename = MaskImage.make_label_filename(path, image_filename, layer)
+        if existing_files is not None:
+            return mask_filename in existing_files
         return os.path.exists(mask_filename)
 
     def set_layer_certified(self, layer, certified):
@@ -241,7 +332,7 @@ class ImageCanvas(QLabel):
     def process_certification_data(self, layer):
         if self.label_path is None or self.filename is None:
             return
-        certification_filepath = CertificationData.make_certification_filename(self.label_path, self.filename, layer)
+        certification_filepath = self._cert_paths[layer]
         previous_certification_data = CertificationData.load(certification_filepath)
         if (
             previous_certification_data.hard_example != self.layers_hard_example[layer]
@@ -263,17 +354,20 @@ class ImageCanvas(QLabel):
             self.process_certification_data(layer)
 
     @staticmethod
-    def get_certification_file_flag(certification_filename, flag_name):
-        flag_status = False
+    def load_certification_config(certification_filename):
+        config = {}
         if os.path.exists(certification_filename):
             try:
                 with open(certification_filename, "r") as f:
                     config = json.load(f)
-                    flag_status = config.get(flag_name, False)
             except Exception as e:
                 print("certification file load failure:", e)
 
-        return flag_status
+        return config
+
+    @staticmethod
+    def get_certification_file_flag(certification_filename, flag_name):
+        return ImageCanvas.load_certification_config(certification_filename).get(flag_name, False)
 
     @staticmethod
     def certification_status(certification_filename):
@@ -283,30 +377,32 @@ class ImageCanvas(QLabel):
     def hard_example_status(certification_filename):
         return ImageCanvas.get_certification_file_flag(certification_filename, "hard_example")
 
-    def update_layer_checkboxes(self, layers_checkboxes, layers_cache, checked_status_function):
+    def update_layer_checkboxes(self, layers_checkboxes, layers_cache, flag_name, configs):
         for layer, checkbox in layers_checkboxes.items():
-            certification_filename = CertificationData.make_certification_filename(
-                self.label_path, self.filename, layer
-            )
-            status = checked_status_function(certification_filename)
+            status = configs[layer].get(flag_name, False)
             layers_cache[layer] = status
             checkbox.blockSignals(True)
             checkbox.setChecked(status)
             checkbox.blockSignals(False)
 
-    def update_certification_layers(self, layers_checkboxes, layers_cache):
-        self.update_layer_checkboxes(layers_checkboxes, layers_cache, ImageCanvas.certification_status)
-        self.layers_certified = layers_cache.copy()
+    def update_certification_and_hard_example_layers(
+        self, certification_checkboxes, certified_cache, hard_example_checkboxes, hard_example_cache
+    ):
+        """Refresh both checkbox sets from one read and parse per certification file."""
+        configs = {}
+        for layer in certification_checkboxes.keys() | hard_example_checkboxes.keys():
+            configs[layer] = ImageCanvas.load_certification_config(self._cert_paths[layer])
 
-    def update_hard_example_layers(self, layers_checkboxes, layers_cache):
-        self.update_layer_checkboxes(layers_checkboxes, layers_cache, ImageCanvas.hard_example_status)
-        self.layers_hard_example = layers_cache.copy()
+        self.update_layer_checkboxes(certification_checkboxes, certified_cache, "certified", configs)
+        self.layers_certified = certified_cache.copy()
+        self.update_layer_checkboxes(hard_example_checkboxes, hard_example_cache, "hard_example", configs)
+        self.layers_hard_example = hard_example_cache.copy()
 
     def update_has_mask_layers(self, layers_has_mask):
         layers_has_mask.clear()
         for layer in self.layers:
             if layer == self.layer:
-                layers_has_mask[layer] = self.img.mask().any()
+                layers_has_mask[layer] = self.img.mask_any()
             else:
                 layers_has_mask[layer] = ImageCanvas.layer_has_mask(self.label_path, self.filename, layer)
 
@@ -319,6 +415,17 @@ class ImageCanvas(QLabel):
     def set_layers(self, layers):
         self.layers = layers
         self.layer = self.layers[0]
+        self._rebuild_cert_paths()
+
+    def _rebuild_cert_paths(self):
+        """Per-layer certification filenames, rebuilt when the image or layer list changes."""
+        self._cert_paths = {}
+        if self.layers is None or self.label_path is None or self.filename is None:
+            return
+        for layer in self.layers:
+            self._cert_paths[layer] = CertificationData.make_certification_filename(
+                self.label_path, self.filename, layer
+            )
 
     def set_sliders(self, sliders):
         self.sliders = sliders
@@ -360,19 +467,22 @@ class ImageCanvas(QLabel):
         return self.get_radius(DEFAULT_PEN_START_RADIUS, self.polygon_start_zoom)
 
     def brush_radius(self):
-        return int(self.get_radius(DEFAULT_BRUSH_RADIUS, self.brush_zoom))
+        return self._cached_brush_radius
+
+    def _refresh_scale_cache(self):
+        if self.img is not None:
+            self._cached_scale = self.img.get_scale()
+            self._cached_inv_scale = 1.0 / self._cached_scale
+        self._cached_brush_radius = int(self.get_radius(DEFAULT_BRUSH_RADIUS, self.brush_zoom))
 
     def set_app(self, app):
         self.app = app
 
     def mouseMoveEvent(self, evt):
+        # This fires at display rate during drags; frozenset membership against a
+        # prebuilt table beats rebuilding a list of enum members per event.
         pos = self.get_cursor_position()
-        if self.mode not in [
-            ImageCanvas.Drawing.POLYGON_DRAW_MODE,
-            ImageCanvas.Drawing.POLYGON_ERASER_MODE,
-            ImageCanvas.Drawing.POLYLINE_MODE,
-            ImageCanvas.Drawing.FLOOD_FILL_MODE,
-        ]:
+        if self.mode not in ImageCanvas.CLICK_DRIVEN_MODES:
             self.handle_button(self.app.mouseButtons())
         if pos.x() == evt.x() and pos.y() == evt.y():
             self._draw_current()
@@ -394,10 +504,10 @@ class ImageCanvas(QLabel):
             self.img.reset_polygon_data()
 
     def _to_original_scale(self, value):
-        return round(value / self.img.get_scale())
+        return round(value * self._cached_inv_scale)
 
     def _to_current_scale(self, value):
-        return round(value * self.img.get_scale())
+        return round(value * self._cached_scale)
 
     def finish_polyshape(self):
         if self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
@@ -407,9 +517,10 @@ class ImageCanvas(QLabel):
             last_x, last_y = self._to_original_scale(self.last_x), self._to_original_scale(self.last_y)
             radius = self._to_original_scale(self.pen_start_radius())
 
-        return np.power(last_x - self.polyshape_finish_point_x, 2.0) + np.power(
-            last_y - self.polyshape_finish_point_y, 2.0
-        ) <= np.power(radius, 2.0)
+        # Plain scalar math: np.power dispatched through ufunc machinery on every mouse move.
+        dx = last_x - self.polyshape_finish_point_x
+        dy = last_y - self.polyshape_finish_point_y
+        return dx * dx + dy * dy <= radius * radius
 
     def remember_polyshape_state(self):
         self.prev_polyshape_finish_point_x = self.polyshape_finish_point_x
@@ -428,100 +539,100 @@ class ImageCanvas(QLabel):
             )
 
     def handle_button(self, button):
-        if (
-            self.mode == ImageCanvas.Drawing.ERASER_MODE or self.mode == ImageCanvas.Drawing.DRAW_MODE
-        ) and button == Qt.LeftButton:
-            assert (self.prev_draw_x is not None) == (self.prev_draw_y is not None)
-            if self.mode == ImageCanvas.Drawing.ERASER_MODE:
-                if self.prev_draw_x is None:
-                    self.img.mask_erase(self.last_x, self.last_y, self.brush_radius())
-                else:
-                    self.img.erase_line(
-                        (self._to_original_scale(self.prev_draw_x), self._to_original_scale(self.prev_draw_y)),
-                        (self._to_original_scale(self.last_x), self._to_original_scale(self.last_y)),
-                        self._to_original_scale(self.brush_radius()),
-                    )
-            if self.mode == ImageCanvas.Drawing.DRAW_MODE:
-                if self.prev_draw_x is None:
-                    self.img.mask_draw(self.last_x, self.last_y, self.brush_radius())
-                else:
-                    self.img.draw_line(
-                        (self._to_original_scale(self.prev_draw_x), self._to_original_scale(self.prev_draw_y)),
-                        (self._to_original_scale(self.last_x), self._to_original_scale(self.last_y)),
-                        self._to_original_scale(self.brush_radius()),
-                    )
-            self.prev_draw_x = self.last_x
-            self.prev_draw_y = self.last_y
-        if (self.mode == ImageCanvas.Drawing.BOX_MODE or self.moving_mask) and button == Qt.LeftButton:
-            if self.box_begin is None:
-                self.box_begin = (self.last_x, self.last_y)
-        if (
-            self.mode
-            in [
-                ImageCanvas.Drawing.POLYGON_DRAW_MODE,
-                ImageCanvas.Drawing.POLYGON_ERASER_MODE,
-                ImageCanvas.Drawing.POLYLINE_MODE,
-            ]
-        ) and button == Qt.LeftButton:
-            if self.mode == ImageCanvas.Drawing.POLYGON_DRAW_MODE:
-                mode = MaskImage.Action.POLYGON_DRAW_MODE
-            elif self.mode == ImageCanvas.Drawing.POLYGON_ERASER_MODE:
-                mode = MaskImage.Action.POLYGON_ERASER_MODE
-            elif self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
-                mode = MaskImage.Action.POLYLINE_MODE
-            # initializing polyshape
-            if self.polyshape_finish_point_x is None and self.polyshape_finish_point_y is None:
-                if self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
-                    self.polyshape_finish_point_x = self.last_x
-                    self.polyshape_finish_point_y = self.last_y
-                else:
-                    self.polyshape_finish_point_x = self._to_original_scale(self.last_x)
-                    self.polyshape_finish_point_y = self._to_original_scale(self.last_y)
-                self.polyshape_points_stack = []
-                self.img.clean_undo_stack_polyshape()
-                self.img.undo_stack.append(mode)
-                self.remember_polyshape_points_data(self.last_x, self.last_y)
-            # closing polyshape
-            elif self.finish_polyshape():
-                if self.mode in [ImageCanvas.Drawing.POLYGON_DRAW_MODE, ImageCanvas.Drawing.POLYGON_ERASER_MODE]:
-                    if len(self.polyshape_points_stack) > 2:
-                        self.last_x = self._to_current_scale(self.polyshape_finish_point_x)
-                        self.last_y = self._to_current_scale(self.polyshape_finish_point_y)
-                        self.img.polygon_line(
-                            (self.prev_polyshape_point_x, self.prev_polyshape_point_y),
-                            (self.last_x, self.last_y),
-                            self.prev_polyshape_scale,
-                            mode,
-                        )
-                        self.img.fill_polygon(mode)
-                elif self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
-                    self.img.undo_stack.append(mode)
-                self.remember_polyshape_state()
-                self.remember_polyshape_points_data(self.last_x, self.last_y)
+        if button == Qt.LeftButton:
+            handler = self._button_handlers.get(self.mode)
+            if handler is not None:
+                handler()
+            if self.moving_mask and self.mode != ImageCanvas.Drawing.BOX_MODE:
+                self._begin_box()
+        if button == Qt.RightButton:
+            self.undo_mask()
+
+    def _handle_eraser_mode(self):
+        assert (self.prev_draw_x is not None) == (self.prev_draw_y is not None)
+        if self.prev_draw_x is None:
+            self.img.mask_erase(self.last_x, self.last_y, self.brush_radius())
+        else:
+            self.img.erase_line(
+                (self._to_original_scale(self.prev_draw_x), self._to_original_scale(self.prev_draw_y)),
+                (self._to_original_scale(self.last_x), self._to_original_scale(self.last_y)),
+                self._to_original_scale(self.brush_radius()),
+            )
+        self.prev_draw_x = self.last_x
+        self.prev_draw_y = self.last_y
+
+    def _handle_draw_mode(self):
+        assert (self.prev_draw_x is not None) == (self.prev_draw_y is not None)
+        if self.prev_draw_x is None:
+            self.img.mask_draw(self.last_x, self.last_y, self.brush_radius())
+        else:
+            self.img.draw_line(
+                (self._to_original_scale(self.prev_draw_x), self._to_original_scale(self.prev_draw_y)),
+                (self._to_original_scale(self.last_x), self._to_original_scale(self.last_y)),
+                self._to_original_scale(self.brush_radius()),
+            )
+        self.prev_draw_x = self.last_x
+        self.prev_draw_y = self.last_y
+
+    def _begin_box(self):
+        if self.box_begin is None:
+            self.box_begin = (self.last_x, self.last_y)
+
+    def _handle_seed_mode(self):
+        self.img.seed_draw(self.last_x, self.last_y, self.brush_radius())
+
+    def _handle_flood_fill_mode(self):
+        self.img.flood_fill(self._to_original_scale(self.last_x), self._to_original_scale(self.last_y))
+
+    def _handle_polyshape_mode(self):
+        mode = ImageCanvas.POLYSHAPE_ACTIONS[self.mode]
+        # initializing polyshape
+        if self.polyshape_finish_point_x is None and self.polyshape_finish_point_y is None:
+            if self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
+                self.polyshape_finish_point_x = self.last_x
+                self.polyshape_finish_point_y = self.last_y
             else:
-                if self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
-                    self.img.draw_polyline(
-                        (self.prev_polyshape_point_x, self.prev_polyshape_point_y),
-                        (self.last_x, self.last_y),
-                        self.prev_polyshape_scale,
-                        DEFAULT_POLYLINE_THICKNESS,
-                    )
-                    self.polyshape_finish_point_x = self.last_x
-                    self.polyshape_finish_point_y = self.last_y
-                else:
+                self.polyshape_finish_point_x = self._to_original_scale(self.last_x)
+                self.polyshape_finish_point_y = self._to_original_scale(self.last_y)
+            self.polyshape_points_stack = []
+            self.img.clean_undo_stack_polyshape()
+            self.img.undo_stack.append(mode)
+            self.remember_polyshape_points_data(self.last_x, self.last_y)
+        # closing polyshape
+        elif self.finish_polyshape():
+            if self.mode in [ImageCanvas.Drawing.POLYGON_DRAW_MODE, ImageCanvas.Drawing.POLYGON_ERASER_MODE]:
+                if len(self.polyshape_points_stack) > 2:
+                    self.last_x = self._to_current_scale(self.polyshape_finish_point_x)
+                    self.last_y = self._to_current_scale(self.polyshape_finish_point_y)
                     self.img.polygon_line(
                         (self.prev_polyshape_point_x, self.prev_polyshape_point_y),
                         (self.last_x, self.last_y),
                         self.prev_polyshape_scale,
                         mode,
                     )
-                self.remember_polyshape_points_data(self.last_x, self.last_y)
-        if self.mode == ImageCanvas.Drawing.SEED_MODE and button == Qt.LeftButton:
-            self.img.seed_draw(self.last_x, self.last_y, self.brush_radius())
-        if self.mode == ImageCanvas.Drawing.FLOOD_FILL_MODE and button == Qt.LeftButton:
-            self.img.flood_fill(self._to_original_scale(self.last_x), self._to_original_scale(self.last_y))
-        if button == Qt.RightButton:
-            self.undo_mask()
+                    self.img.fill_polygon(mode)
+            elif self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
+                self.img.undo_stack.append(mode)
+            self.remember_polyshape_state()
+            self.remember_polyshape_points_data(self.last_x, self.last_y)
+        else:
+            if self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
+                self.img.draw_polyline(
+                    (self.prev_polyshape_point_x, self.prev_polyshape_point_y),
+                    (self.last_x, self.last_y),
+                    self.prev_polyshape_scale,
+                    DEFAULT_POLYLINE_THICKNESS,
+                )
+                self.polyshape_finish_point_x = self.last_x
+                self.polyshape_finish_point_y = self.last_y
+            else:
+                self.img.polygon_line(
+                    (self.prev_polyshape_point_x, self.prev_polyshape_point_y),
+                    (self.last_x, self.last_y),
+                    self.prev_polyshape_scale,
+                    mode,
+                )
+            self.remember_polyshape_points_data(self.last_x, self.last_y)
 
     def mousePressEvent(self, evt):
         if self.img is None:
@@ -588,18 +699,10 @@ class ImageCanvas(QLabel):
                 x = x - self.vis_region_x_start
                 y = y - self.vis_region_y_start
                 if self.img is not None and 0 <= x < self.img.display_width() and 0 <= y < self.img.display_height():
-                    hsvimg = self.img.get_display_hsv()
-                    hugh = hsvimg[y, x, 0]
-                    saturation = hsvimg[y, x, 1]
-                    value = hsvimg[y, x, 2]
-                    rgbimg = self.img.get_display_rgb()
-                    red = rgbimg[y, x, 0]
-                    green = rgbimg[y, x, 1]
-                    blue = rgbimg[y, x, 2]
-                    labimg = self.img.get_display_lab()
-                    lumin = labimg[y, x, 0]
-                    acolor = labimg[y, x, 1]
-                    bcolor = labimg[y, x, 2]
+                    rgb, hsv, lab = self.img.get_display_pixel_colors(x, y)
+                    red, green, blue = rgb
+                    hugh, saturation, value = hsv
+                    lumin, acolor, bcolor = lab
                     color_text = "  [R: %d, G: %d, B: %d], [H: %d, S: %d, V: %d] [L: %d, A: %d, B: %d]" % (
                         red,
                         green,
@@ -616,7 +719,7 @@ class ImageCanvas(QLabel):
                 "Zoom: {} Mouse {}, {}{}".format(self.zoom_level, x_origin, y_origin, color_text)
             )
 
-    def scaling_and_drawing_polyshape_line(self, pen):
+    def scaling_and_drawing_polyshape_line(self, painter, pen):
         # scaled according to previous scale
         scale = self.img.get_scale() / self.prev_polyshape_scale
         x_start = round(self.prev_polyshape_point_x * scale)
@@ -624,12 +727,11 @@ class ImageCanvas(QLabel):
         x_end, y_end = self.last_x, self.last_y
         parameters = x_start, y_start, x_end, y_end
 
-        self.activate_painter(pen, "line", parameters)
+        self.activate_painter(painter, pen, "line", parameters)
         return x_start, y_start
 
-    def activate_painter(self, pen, mode, parameters):
-        painter = QPainter()
-        painter.begin(self)
+    @staticmethod
+    def activate_painter(painter, pen, mode, parameters):
         painter.setPen(pen)
         if mode == "elipse":
             x, y, semi_axis, semi_axis = parameters
@@ -641,87 +743,88 @@ class ImageCanvas(QLabel):
             x_start, y_start, x_end, y_end = parameters
             painter.drawRect(x_start, y_start, x_end, y_end)
 
-        painter.end()
-
     def paintEvent(self, event):
         super().paintEvent(event)
-        if self.visible_pixmap is not None:
-            painter = QPainter()
-            painter.begin(self)
-            painter.drawPixmap(self.visible_rect, self.visible_pixmap)
-            painter.end()
+        # One painter session per frame; every activate_painter call used to
+        # open and close its own QPainter, paying Qt's engine setup each time.
+        painter = QPainter()
+        painter.begin(self)
+        if self.visible_image is not None:
+            painter.drawImage(self.visible_rect, self.visible_image)
 
         if self.last_x is not None and self.last_y is not None:
-            color = None
-            if self.mode == ImageCanvas.Drawing.ERASER_MODE:
-                color = [255, 0, 0]
-            elif self.mode == ImageCanvas.Drawing.DRAW_MODE:
-                color = [64, 255, 64]
-            elif self.mode == ImageCanvas.Drawing.SEED_MODE:
-                color = [90, 180, 90]
-            elif (self.mode == ImageCanvas.Drawing.BOX_MODE or self.moving_mask) and self.box_begin is not None:
-                color = [23, 3, 89]
-
-                pen = QPen(Qt.black, 3, Qt.SolidLine)
-                x, y = self.box_begin
-                w, h = self.last_x - x, self.last_y - y
-                parameters = x, y, w, h
-                self.activate_painter(pen, "rect", parameters)
-            elif (
-                self.mode in [ImageCanvas.Drawing.POLYGON_DRAW_MODE, ImageCanvas.Drawing.POLYGON_ERASER_MODE]
-                and self.polyshape_finish_point_x is not None
-            ):
-                # line
-                if self.mode == ImageCanvas.Drawing.POLYGON_DRAW_MODE:
-                    pen = QPen(QColor(*self.mask_color[:3]), 2, Qt.DashDotLine)
-                elif self.mode == ImageCanvas.Drawing.POLYGON_ERASER_MODE:
-                    pen = QPen(Qt.black, 2, Qt.DashDotLine)
-
-                self.scaling_and_drawing_polyshape_line(pen)
-
-                # circle
-                color_start = [47, 86, 223]
-                pen = QPen(QColor(*color_start), 2, Qt.SolidLine)
-                # parameters
-                radius = self.pen_start_radius()
-                x = self._to_current_scale(self.polyshape_finish_point_x) - radius
-                y = self._to_current_scale(self.polyshape_finish_point_y) - radius
-                parameters = x, y, radius * 2, radius * 2
-                self.activate_painter(pen, "elipse", parameters)
-            elif self.mode == ImageCanvas.Drawing.POLYLINE_MODE:
-                thickness = round(DEFAULT_POLYLINE_THICKNESS * self.img.get_scale())
-                if self.polyshape_finish_point_x is None:
-                    # circle
-                    x_start = self.last_x
-                    y_start = self.last_y
+            color = ImageCanvas.BRUSH_CURSOR_COLORS.get(self.mode)
+            if color is None:
+                if (self.mode == ImageCanvas.Drawing.BOX_MODE or self.moving_mask) and self.box_begin is not None:
+                    color = [23, 3, 89]
+
+                    pen = QPen(Qt.black, 3, Qt.SolidLine)
+                    x, y = self.box_begin
+                    w, h = self.last_x - x, self.last_y - y
+                    parameters = x, y, w, h
+                    self.activate_painter(painter, pen, "rect", parameters)
                 else:
-                    pen = QPen(QColor(*self.mask_color[:3], 100), 2 * thickness, Qt.SolidLine)
-                    pen.setCapStyle(Qt.RoundCap)
-
-                    x_start, y_start = self.scaling_and_drawing_polyshape_line(pen)
-
-                # circle
-                pen = QPen(Qt.black, 2, Qt.SolidLine)
-                # parameters
-                radius = thickness
-                x = x_start - radius
-                y = y_start - radius
-                parameters = x, y, radius * 2, radius * 2
-                self.activate_painter(pen, "elipse", parameters)
-            elif self.mode == ImageCanvas.Drawing.FLOOD_FILL_MODE:
-                pen = QPen(QColor(*self.mask_color[:3]), 4)
-                radius = 2
-                x = self.last_x - radius
-                y = self.last_y - radius
-                parameters = x, y, radius * 2, radius * 2
-                self.activate_painter(pen, "elipse", parameters)
+                    overlay = self._paint_overlays.get(self.mode)
+                    if overlay is not None:
+                        overlay(painter)
             if color is not None and not (self.mode == ImageCanvas.Drawing.BOX_MODE or self.moving_mask):
                 pen = QPen(QColor(*color), 2, Qt.SolidLine)
                 x = self.last_x - self.brush_radius()
                 y = self.last_y - self.brush_radius()
                 parameters = x, y, self.brush_radius() * 2, self.brush_radius() * 2
 
-                self.activate_painter(pen, "elipse", parameters)
+                self.activate_painter(painter, pen, "elipse", parameters)
+        painter.end()
+
+    def _paint_polyshape_overlay(self, painter):
+        if self.polyshape_finish_point_x is None:
+            return
+        # line
+        if self.mode == ImageCanvas.Drawing.POLYGON_DRAW_MODE:
+            pen = QPen(QColor(*self.mask_color[:3]), 2, Qt.DashDotLine)
+        else:
+            pen = QPen(Qt.black, 2, Qt.DashDotLine)
+
+        self.scaling_and_drawing_polyshape_line(painter, pen)
+
+        # circle
+        color_start = [47, 86, 223]
+        pen = QPen(QColor(*color_start), 2, Qt.SolidLine)
+        # parameters
+        radius = self.pen_start_radius()
+        x = self._to_current_scale(self.polyshape_finish_point_x) - radius
+        y = self._to_current_scale(self.polyshape_finish_point_y) - radius
+        parameters = x, y, radius * 2, radius * 2
+        self.activate_painter(painter, pen, "elipse", parameters)
+
+    def _paint_polyline_overlay(self, painter):
+        thickness = round(DEFAULT_POLYLINE_THICKNESS * self.img.get_scale())
+        if self.polyshape_finish_point_x is None:
+            # circle
+            x_start = self.last_x
+            y_start = self.last_y
+        else:
+            pen = QPen(QColor(*self.mask_color[:3], 100), 2 * thickness, Qt.SolidLine)
+            pen.setCapStyle(Qt.RoundCap)
+
+            x_start, y_start = self.scaling_and_drawing_polyshape_line(painter, pen)
+
+        # circle
+        pen = QPen(Qt.black, 2, Qt.SolidLine)
+        # parameters
+        radius = thickness
+        x = x_start - radius
+        y = y_start - radius
+        parameters = x, y, radius * 2, radius * 2
+        self.activate_painter(painter, pen, "elipse", parameters)
+
+    def _paint_flood_fill_overlay(self, painter):
+        pen = QPen(QColor(*self.mask_color[:3]), 4)
+        radius = 2
+        x = self.last_x - radius
+        y = self.last_y - radius
+        parameters = x, y, radius * 2, radius * 2
+        self.activate_painter(painter, pen, "elipse", parameters)
 
     def set_status_widget(self, sw):
         self.status_widget = sw
@@ -764,28 +867,60 @@ class ImageCanvas(QLabel):
         if self.show_all_layers:
             self.make_colors_masks()
 
+    def _label_dir_names(self):
+        """Filenames present in the label directory, from one directory read.
+
+        Most layers have no mask for a given image; checking membership here
+        costs a set lookup instead of a stat (or worse, a full decode) per
+        absent layer.
+        """
+        try:
+            return set(os.listdir(self.label_path))
+        except OSError:
+            return set()
+
     def make_colors_masks(self):
         if self.layers_colors is None:
             return
-        self.colors_masks = []
+        # Parallel colors list and one stacked (L, H, ceil(W / 8)) block of
+        # packed masks; all layers share the image's shape, so the stack keeps
+        # compositing input contiguous instead of L separately boxed pairs.
+        colors = []
+        packed_masks = []
+        shape = None
+        label_names = self._label_dir_names()
         for layer, color in self.layers_colors.items():
             if layer == self.layer:
                 self.mask_color = color
             else:
-                mask = self.get_mask(layer)
-                if mask is not None:
-                    self.colors_masks.append([color, mask.astype(np.bool)])
+                entry = self.get_mask(layer, label_names)
+                if entry is not None:
+                    packed, shape = entry
+                    colors.append(color)
+                    packed_masks.append(packed)
+        self.colors_masks = (colors, np.stack(packed_masks) if packed_masks else None, shape)
+
+    def _layer_has_mask_partial(self):
+        return self._layer_has_mask_partials.setdefault(
+            self.layer, functools.partial(self.layer_has_mask_callback, self.layer)
+        )
 
-    def get_mask(self, layer):
+    def get_mask(self, layer, label_names=None):
         label_file = MaskImage.make_label_filename(self.label_path, self.filename, layer)
-        mask = cv2.imread(label_file, cv2.IMREAD_GRAYSCALE)
-        return mask
+        if label_names is not None and os.path.basename(label_file) not in label_names:
+            return None
+        try:
+            mtime_ns = os.stat(label_file).st_mtime_ns
+        except OSError:
+            return None
+        return _load_mask_packed(label_file, mtime_ns)
 
     def load_image(self, filename, loader, label_path, ppi_value=None):
         if self.filename is not None:
             self.process_layers_certification_data()
         self.filename = filename
         self.label_path = label_path
+        self._rebuild_cert_paths()
         self.ppi_value = ppi_value
         self.save_layer_data()
         self.update_colors_masks_information()
@@ -801,7 +936,7 @@ class ImageCanvas(QLabel):
             self.ppi_value,
             self.destination_layer,
             self.mask_opacity_value,
-            functools.partial(self.layer_has_mask_callback, self.layer),
+            self._layer_has_mask_partial(),
             self.layer_has_mask_callback,
             self.apply_show_all_layers,
             self.contrast_value,
@@ -821,37 +956,12 @@ class ImageCanvas(QLabel):
         if self.img:
             self.process_layers_certification_data()
             self.save_layer_data()
-            img_data = None
-            depth_data = None
-            if self.img is not None:
-                img_data = self.img.origin_img
-                depth_data = self.img.depth
             self.update_colors_masks_information()
-            img = MaskImage.from_image(
-                self.filename,
-                self.label_path,
-                img_data,
-                depth_data,
-                self.mask_images,
-                self.mask_only,
-                self.show_depth,
-                self.layer,
-                self.show_inch_grid,
-                self.ppi_value,
-                self.destination_layer,
-                self.mask_opacity_value,
-                functools.partial(self.layer_has_mask_callback, self.layer),
-                self.layer_has_mask_callback,
-                self.apply_show_all_layers,
-                self.contrast_value,
-                self.brightness_value,
-                self.hue_value,
-                self.show_all_layers,
-                self.colors_masks,
-                self.mask_color,
-                self._normalized_image_roi,
-            )
-            self.set_new_image(img)
+            # The pixels have not changed, so rebind the layer state in place
+            # instead of rebuilding the MaskImage and re-running the
+            # contrast/brightness/hue pipeline over the whole image.
+            self.img.switch_layer(self.layer, self.colors_masks, self.mask_color, self._layer_has_mask_partial())
+            self.set_new_image(self.img)
 
         update_layer_information_callback()
 
@@ -863,6 +973,7 @@ class ImageCanvas(QLabel):
         self._disable_updates()
         try:
             self.img = img
+            self._pixmap_key = None
             self._set_zoom()
             self._new_image_update()
             self._reset_sliders()
@@ -883,6 +994,11 @@ class ImageCanvas(QLabel):
         height = bound_rect.height()
         if width == 0 or height == 0:
             return
+        # Identical viewport, zoom and image generation means chopped_display
+        # would produce the same crop; skip the recrop, resize and QImage wrap.
+        key = (bound_rect.x(), bound_rect.y(), width, height, self.zoom_level, self.img.generation)
+        if key == self._pixmap_key and self.visible_image is not None:
+            return
         self.vis_region_x_start = bound_rect.x()
         self.vis_region_y_start = bound_rect.y()
 
@@ -893,26 +1009,28 @@ class ImageCanvas(QLabel):
             self._to_original_scale(height) + 1,
         )
 
-        self.vis_region_x_end = self.vis_region_x_start + self.img.display_width()
-        self.vis_region_y_end = self.vis_region_y_start + self.img.display_height()
-
-        bytes_per_line = self.img.display_channels() * self.img.display_width()
-        qimg = QImage(
-            img.data, self.img.display_width(), self.img.display_height(), bytes_per_line, QImage.Format_RGB888
-        )
-        self.visible_rect = QRect(
-            self.vis_region_x_start, self.vis_region_y_start, self.img.display_width(), self.img.display_height()
-        )
-
-        self.visible_pixmap = QPixmap(qimg)
+        # Bind the display geometry once, after chopped_display has refreshed
+        # it; consistent locals also keep bytes_per_line and the QImage size in
+        # step should the image mutate mid-frame.
+        display_width = self.img.display_width()
+        display_height = self.img.display_height()
+        self.vis_region_x_end = self.vis_region_x_start + display_width
+        self.vis_region_y_end = self.vis_region_y_start + display_height
+
+        bytes_per_line = self.img.display_channels() * display_width
+        # The QImage wraps the display buffer in place; converting it to a QPixmap
+        # copied the whole visible region again on every brush-drag frame.
+        # _display_keepalive pins the numpy buffer the QImage points into.
+        self._display_keepalive = img
+        self.visible_image = QImage(img.data, display_width, display_height, bytes_per_line, QImage.Format_RGB888)
+        self.visible_rect = QRect(self.vis_region_x_start, self.vis_region_y_start, display_width, display_height)
+        self._pixmap_key = key
 
     @staticmethod
     def within_limits(point, low_limit, upper_limit):
-        if point < low_limit:
-            point = low_limit
-        if upper_limit and point > upper_limit:
-            point = upper_limit
-
+        point = max(point, low_limit)
+        if upper_limit:
+            point = min(point, upper_limit)
         return point
 
     def get_cursor_position(self):
@@ -932,9 +1050,20 @@ class ImageCanvas(QLabel):
         self._scroll_update = True
 
     def scroll_update(self):
-        if self._scroll_update:
-            self.get_cursor_position()
-            self._draw_current()
+        if not self._scroll_update:
+            return
+        # Scroll ticks fire whether or not anything moved; skip the global
+        # cursor roundtrip and redraw when both cursor and viewport are where
+        # they were.  The rect is re-read here so a thumb move without a mouse
+        # move still redraws.
+        bound_rect = self.visibleRegion().boundingRect()
+        pos = QCursor.pos()
+        key = (pos.x(), pos.y(), bound_rect.x(), bound_rect.y())
+        if key == self._last_cursor_key:
+            return
+        self._last_cursor_key = key
+        self.get_cursor_position()
+        self._draw_current()
 
     def _draw_current(self):
         if self.img is None:
@@ -980,6 +1109,7 @@ class ImageCanvas(QLabel):
 
         if amt is not None:
             self.img.set_scale(amt)
+            self._refresh_scale_cache()
             self.setFixedSize(
                 QSize(self._to_current_scale(self.img.roi_width), self._to_current_scale(self.img.roi_height),)
             )
@@ -1068,7 +1198,7 @@ class ImageCanvas(QLabel):
             self.moving_mask = move
 
     def set_normalized_image_roi(self, image_roi: List[float]):
-        self._normalized_image_roi = image_roi
+        self._normalized_image_roi = np.asarray(image_roi, dtype=np.float32)
 
         def set_roi(image_canvas):
             image_canvas.img.set_roi(self._normalized_image_roi)
@@ -1121,7 +1251,10 @@ class ImageCanvas(QLabel):
     def perform_action_on_image_and_redraw(self, action):
         if self.img is not None:
             action()
-        self._draw_current()
+        # While updates are disabled a batch caller owns the single redraw at
+        # the end; skipping the per-action draws makes replays O(1) in renders.
+        if self._scroll_update:
+            self._draw_current()
 
     def auto_mask_DL(self, channel):
         self.perform_action_on_image_and_redraw(lambda: self.img.generate_auto_mask_DL(channel))
@@ -1181,37 +1314,51 @@ class ImageCanvas(QLabel):
         if len(self.settings.algo_stack) == 0:
             return
 
+        self._disable_updates()
+        try:
+            self._replay_algo_stack()
+        finally:
+            self._enable_updates()
+            self._draw_current()
+
+    def _replay_algo_stack(self):
         self.undo_all_masks()
         algo_stack = json.loads(self.settings.algo_stack)
         for algo, value in algo_stack:
-            if algo == "Algorithm.AUTO_MASK_DL":
-                if torchscript_model.is_loaded():
-                    self.auto_mask_DL(value)
-            elif algo == "Algorithm.LAB_AUTO_MASK":
-                self.lab_auto_mask()
-            elif algo == "Algorithm.CLUSTERING":
-                self.settings.clusters_amount = int(value)
-                self.clustering()
-            elif algo == "Algorithm.BRIGHT_AUTO_MASK":
-                self.bright_auto_mask()
-            elif algo == "Algorithm.DILATION":
-                self.settings.dilation_iterations = int(value)
-                self.dilation()
-            elif algo == "Algorithm.EROSION":
-                self.settings.erosion_iterations = int(value)
-                self.erosion()
-            elif algo == "Algorithm.REMOVING_OBJECTS":
-                self.settings.removing_objects_size = int(value)
-                self.removing_objects()
-            elif algo == "Algorithm.CLOSING_ITERATIONS":
-                self.settings.closing_iterations_image = int(value)
-                self.closing_iterations_image_apply()
+            handler = self._algo_dispatch.get(algo)
+            if handler is not None:
+                handler(value)
+
+    def _replay_auto_mask_DL(self, value):
+        if torchscript_model.is_loaded():
+            self.auto_mask_DL(value)
+
+    def _replay_clustering(self, value):
+        self.settings.clusters_amount = int(value)
+        self.clustering()
+
+    def _replay_dilation(self, value):
+        self.settings.dilation_iterations = int(value)
+        self.dilation()
+
+    def _replay_erosion(self, value):
+        self.settings.erosion_iterations = int(value)
+        self.erosion()
+
+    def _replay_removing_objects(self, value):
+        self.settings.removing_objects_size = int(value)
+        self.removing_objects()
+
+    def _replay_closing_iterations(self, value):
+        self.settings.closing_iterations_image = int(value)
+        self.closing_iterations_image_apply()
 
     def small_brush(self):
         if self.mode == ImageCanvas.Drawing.POLYGON_DRAW_MODE:
             self.polygon_start_zoom -= 1
         else:
             self.brush_zoom -= 1
+        self._refresh_scale_cache()
         self._draw_current()
 
     def big_brush(self):
@@ -1219,6 +1366,7 @@ class ImageCanvas(QLabel):
             self.polygon_start_zoom += 1
         else:
             self.brush_zoom += 1
+        self._refresh_scale_cache()
         self._draw_current()
 
     def undo_all_masks(self):
@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
+
 import numpy as np
 from PyQt5.QtGui import QPainter, QImage
 from PyQt5.QtWidgets import QLabel
@@ -23,6 +25,17 @@ from PyQt5.QtCore import Qt, QRect
 from utils import decode_color, make_texture
 
 
+@functools.lru_cache(maxsize=None)
+def _swatch_texture(shape, rgb_color, texture_id):
+    """Contiguous (H, W, 3) uint8 swatch, shared across widgets with the same color.
+
+    Integer arithmetic end-to-end: the mono texture is 0/1, so the product fits
+    uint8 without a float64 broadcast chain and cast.
+    """
+    mono_texture = make_texture(shape, texture_id)
+    return mono_texture[:, :, None].astype(np.uint8) * np.asarray(rgb_color, dtype=np.uint8)
+
+
 class ColorWidget(QLabel):
     WIDTH = 20
     HEIGHT = 15
@@ -33,15 +46,11 @@ class ColorWidget(QLabel):
         self.setFixedHeight(ColorWidget.HEIGHT)
 
         rgb_color, texture_id = decode_color(color)
-        mono_texture = make_texture((ColorWidget.HEIGHT, ColorWidget.WIDTH), texture_id)
-        texture = (
-            np.ones((ColorWidget.HEIGHT, ColorWidget.WIDTH, 3))
-            * np.array(rgb_color)
-            * mono_texture.reshape(ColorWidget.HEIGHT, ColorWidget.WIDTH, 1)
-        )
+        texture = _swatch_texture((ColorWidget.HEIGHT, ColorWidget.WIDTH), rgb_color, texture_id)
 
         self.rect = QRect(0, 0, ColorWidget.WIDTH, ColorWidget.HEIGHT)
-        self.image = QImage(texture.astype(np.uint8), ColorWidget.WIDTH, ColorWidget.HEIGHT, QImage.Format_RGB888)
+        # The QImage wraps the cached buffer in place; the cache keeps it alive.
+        self.image = QImage(texture, ColorWidget.WIDTH, ColorWidget.HEIGHT, QImage.Format_RGB888)
         self.draw_mode = False
 
     def set_draw_mode(self, mode):
@@ -25,8 +25,19 @@ from PyQt5.QtWidgets import QPushButton
 from maka_ui.constants import ICONS_FOLDER
 from utils import get_root_dir
 
+ICON_PATH = os.path.join(get_root_dir(), ICONS_FOLDER, "question.png")
+
 
 class HelpLinkWidget(QPushButton):
+    _icon = None
+
+    @classmethod
+    def _get_icon(cls) -> QIcon:
+        """One shared QIcon; per-instance loads re-decoded the PNG for every help button."""
+        if cls._icon is None:
+            cls._icon = QIcon(ICON_PATH)
+        return cls._icon
+
     def __init__(self, link: str) -> None:
         super().__init__()
         self.setFixedWidth(15)
@@ -36,7 +47,7 @@ class HelpLinkWidget(QPushButton):
                 QPushButton {border: none;}
             """
         )
-        self.setIcon(QIcon(os.path.join(get_root_dir(), ICONS_FOLDER, "question.png")))
+        self.setIcon(self._get_icon())
         self.setIconSize(QSize(15, 15))
         self.link = link
         self.clicked.connect(self.open)
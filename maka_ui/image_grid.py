@@ -15,10 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from PyQt5.QtWidgets import QButtonGroup, QWidget, QGridLayout, QPushButton, QVBoxLayout, QLabel, QHBoxLayout, QLineEdit
-from typing import Optional, List, Callable
-from PyQt5.QtCore import Qt
-from typing import Callable
+from PyQt5.QtWidgets import QWidget, QPushButton, QVBoxLayout, QFormLayout, QLineEdit
+from typing import Optional, Callable
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QColor, QImage, QIntValidator, QPainter
+
+import numpy as np
 
 
 class ImageGridSizeSetter(QWidget):
@@ -28,86 +30,126 @@ class ImageGridSizeSetter(QWidget):
         self.setWindowTitle("Set Grid Size:")
         self.main_layout: QVBoxLayout = QVBoxLayout(self)
 
-        self._rows_text_valid: bool = False
-        self._columns_text_valid: bool = False
-
-        self.add_rows_widget()
-        self.add_columns_widget()
-        self.add_set_button(set_grid_size)
+        self._rows_value: Optional[int] = None
+        self._columns_value: Optional[int] = None
+        self._set_grid_size: Callable = set_grid_size
 
-    def add_set_button(self, set_grid_size: Callable) -> None:
-        def button_click(image_grid_size_setter: ImageGridSizeSetter):
-            set_grid_size(
-                [int(image_grid_size_setter.rows_input.text()), int(image_grid_size_setter.columns_input.text())]
-            )
-            self.close()
+        self.add_inputs()
+        self.add_set_button()
 
+    def add_set_button(self) -> None:
         self.set_button: QPushButton = QPushButton("Set")
-        self.set_button.clicked.connect(lambda: button_click(self))
+        # A bound method instead of a lambda-plus-closure pair; nothing extra
+        # is captured and the connection can be disconnected if ever needed.
+        self.set_button.clicked.connect(self._on_set_clicked)
         self.set_button.setEnabled(False)
 
         self.main_layout.addWidget(self.set_button)
 
-    def add_widget(self, label: QLabel, input: QLineEdit) -> None:
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-
-        layout.addWidget(label)
-        layout.addWidget(input)
-
-        self.main_layout.addWidget(widget)
-
-    @staticmethod
-    def create_label(name: str) -> QLabel:
-        label: QLabel = QLabel(name)
-        label.setFixedWidth(80)
+    def _on_set_clicked(self) -> None:
+        self._set_grid_size([self._rows_value, self._columns_value])
+        self.close()
 
-        return label
+    def add_inputs(self) -> None:
+        # One form layout for both rows; per-row container widgets and
+        # QHBoxLayouts doubled the dialog's widget count for no visual gain.
+        form = QFormLayout()
+        self.rows_input: QLineEdit = ImageGridSizeSetter.create_input(self.rows_text_changed)
+        self.columns_input: QLineEdit = ImageGridSizeSetter.create_input(self.columns_text_changed)
+        form.addRow("Rows:", self.rows_input)
+        form.addRow("Columns:", self.columns_input)
+        self.main_layout.addLayout(form)
 
     @staticmethod
     def create_input(text_changed: Callable) -> QLineEdit:
         input: QLineEdit = QLineEdit()
+        # Qt rejects non-digit keystrokes natively, so validation never takes
+        # the exception path in Python.
+        input.setValidator(QIntValidator(1, 999999, input))
         input.textChanged.connect(text_changed)
 
         return input
 
-    def add_rows_widget(self) -> None:
-        label: QLabel = ImageGridSizeSetter.create_label("Rows:")
-        self.rows_input: QLineEdit = ImageGridSizeSetter.create_input(self.rows_text_changed)
-        self.add_widget(label, self.rows_input)
-
-    def add_columns_widget(self) -> None:
-        label: QLabel = ImageGridSizeSetter.create_label("Columns:")
-        self.columns_input: QLineEdit = ImageGridSizeSetter.create_input(self.columns_text_changed)
-        self.add_widget(label, self.columns_input)
-
     @staticmethod
-    def text_changed(input: QLineEdit) -> bool:
-        try:
-            number = int(input.text())
-            if number > 0:
-                return True
-        except ValueError:
-            pass
+    def text_changed(input: QLineEdit) -> Optional[int]:
+        """Validated positive integer from the field, or None.
 
-        return False
+        Parsed once per keystroke; the Set handler reuses the cached value
+        instead of re-parsing on click.
+        """
+        if input.hasAcceptableInput():
+            return int(input.text())
+        return None
 
     def rows_text_changed(self) -> None:
-        self._rows_text_valid = ImageGridSizeSetter.text_changed(self.rows_input)
+        self._rows_value = ImageGridSizeSetter.text_changed(self.rows_input)
         self.change_set_button_state()
 
     def columns_text_changed(self) -> None:
-        self._columns_text_valid = ImageGridSizeSetter.text_changed(self.columns_input)
+        self._columns_value = ImageGridSizeSetter.text_changed(self.columns_input)
         self.change_set_button_state()
 
     def change_set_button_state(self) -> None:
-        self.set_button.setEnabled((self._rows_text_valid and self._columns_text_valid))
+        self.set_button.setEnabled(self._rows_value is not None and self._columns_value is not None)
 
     def closeEvent(self, evt):
         evt.accept()
         self.deleteLater()
 
 
+class GridCanvas(QWidget):
+    """The clickable cell area of ImageGridUI, painted from a one-pixel-per-cell image.
+
+    One widget replaces rows * columns styled QPushButtons; repaints scale the
+    tiny backing image in a single blit and clicks map back to cells with
+    integer division.
+    """
+
+    CELL_SIZE = 20
+    UNCHECKED_COLOR = QColor(250, 240, 230)
+    CHECKED_COLOR = QColor(117, 218, 255)
+    BORDER_COLOR = QColor(255, 0, 0)
+
+    def __init__(self, rows: int, columns: int, cell_clicked: Callable):
+        super().__init__()
+        self._rows = rows
+        self._columns = columns
+        self._cell_clicked = cell_clicked
+        self._cells = QImage(columns, rows, QImage.Format_RGB32)
+        self._cells.fill(GridCanvas.UNCHECKED_COLOR)
+        self.setFixedWidth(columns * GridCanvas.CELL_SIZE)
+        self.setFixedHeight(rows * GridCanvas.CELL_SIZE)
+        # paintEvent covers every pixel, so Qt can skip erasing the background
+        # before each repaint.
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setAutoFillBackground(False)
+
+    def set_cell_checked(self, id: int, checked: bool) -> None:
+        color = GridCanvas.CHECKED_COLOR if checked else GridCanvas.UNCHECKED_COLOR
+        self._cells.setPixelColor(id % self._columns, id // self._columns, color)
+        self.update()
+
+    def mousePressEvent(self, evt) -> None:
+        column = evt.x() // GridCanvas.CELL_SIZE
+        row = evt.y() // GridCanvas.CELL_SIZE
+        if 0 <= row < self._rows and 0 <= column < self._columns:
+            self._cell_clicked(row * self._columns + column)
+
+    def paintEvent(self, evt) -> None:
+        painter = QPainter()
+        painter.begin(self)
+        # No smooth-transform hint, so the cell image scales up as solid blocks.
+        painter.drawImage(self.rect(), self._cells)
+        painter.setPen(GridCanvas.BORDER_COLOR)
+        for row in range(self._rows + 1):
+            y = min(row * GridCanvas.CELL_SIZE, self.height() - 1)
+            painter.drawLine(0, y, self.width() - 1, y)
+        for column in range(self._columns + 1):
+            x = min(column * GridCanvas.CELL_SIZE, self.width() - 1)
+            painter.drawLine(x, 0, x, self.height() - 1)
+        painter.end()
+
+
 class ImageGridUI(QWidget):
     def __init__(self, set_rectangle: Callable, rows: int, columns: int):
         super().__init__()
@@ -117,61 +159,42 @@ class ImageGridUI(QWidget):
         self._previous_button_id: Optional[int] = None
         self.create_ui_grid()
 
-    def add_grid_button(self, row: int, column: int) -> QPushButton:
-        button: QPushButton = QPushButton(self)
-        button.setCheckable(True)
-        button.setStyleSheet(
-            """
-                       QPushButton {background:rgb(250,240,230); border: 1px solid red;}
-                       QPushButton::checked{background:rgb(117, 218, 255); border: 1px solid red;}
-                   """
-        )
-
-        self.grid_layout.addWidget(button, row, column)
-        button.setFixedHeight(20)
-        button.setFixedWidth(20)
-
-        return button
-
     def create_ui_grid(self) -> None:
-        self.grid_buttons: QButtonGroup = QButtonGroup()
-        self.grid_buttons.setExclusive(True)
         self.main_layout: QVBoxLayout = QVBoxLayout(self)
         self.main_layout.setSpacing(1)
-        self.main_layout.setContentsMargins(0, 0, 5, 0)
-        label: QLabel = QLabel("Crop Image")
-        label.setAlignment(Qt.AlignCenter)
-        label.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.addWidget(label)
-        widget: QWidget = QWidget()
-        self.grid_layout: QGridLayout = QGridLayout(widget)
-        self.main_layout.addWidget(widget)
-        self.grid_layout.setSpacing(0)
-        self.grid_layout.setSizeConstraint(3)
-        for r in range(self._rows):
-            for c in range(self._columns):
-                self.grid_buttons.addButton(self.add_grid_button(r, c), self._columns * r + c)
-
-        self.grid_buttons.buttonClicked[int].connect(self.set_rectangle)
+        # The caption is painted directly in paintEvent; its height is
+        # reserved as a top margin instead of spending a QLabel on one
+        # static string.
+        self._caption_height: int = self.fontMetrics().height()
+        self.main_layout.setContentsMargins(0, self._caption_height + 1, 5, 0)
+        self.grid_canvas: GridCanvas = GridCanvas(self._rows, self._columns, self.set_rectangle)
+        self.main_layout.addWidget(self.grid_canvas, alignment=Qt.AlignCenter)
+
+    def paintEvent(self, evt) -> None:
+        super().paintEvent(evt)
+        painter = QPainter()
+        painter.begin(self)
+        painter.drawText(QRect(0, 0, self.width(), self._caption_height), Qt.AlignHCenter | Qt.AlignTop, "Crop Image")
+        painter.end()
 
     def set_rectangle(self, id: int) -> None:
-        button: QPushButton = self.grid_buttons.button(id)
-        if button.isChecked() and id == self._previous_button_id:
-            self.grid_buttons.setExclusive(False)
-            button.setChecked(False)
+        if id == self._previous_button_id:
+            self.grid_canvas.set_cell_checked(id, False)
             self._previous_button_id = None
-            self.grid_buttons.setExclusive(True)
+            self._image_grid.set_rectangle(False, id)
         else:
+            if self._previous_button_id is not None:
+                self.grid_canvas.set_cell_checked(self._previous_button_id, False)
+            self.grid_canvas.set_cell_checked(id, True)
             self._previous_button_id = id
-        self._image_grid.set_rectangle(button.isChecked(), id)
+            self._image_grid.set_rectangle(True, id)
 
     def _move_horizontally(self, direction: int) -> None:
         if self._previous_button_id is None:
             return
         id: int = self._previous_button_id + direction
         if 0 <= id < self._rows * self._columns:
-            button: QPushButton = self.grid_buttons.button(id)
-            button.animateClick()
+            self.set_rectangle(id)
 
     def go_left(self) -> None:
         self._move_horizontally(-1)
@@ -181,7 +204,19 @@ class ImageGridUI(QWidget):
 
 
 class ImageGrid:
+    __slots__ = (
+        "_set_rectangle",
+        "_rows",
+        "_columns",
+        "_cell_width",
+        "_cell_width_margin",
+        "_cell_height",
+        "_cell_height_margin",
+        "_rects",
+    )
+
     MARGIN_PERCENT = 0.2
+    FULL_RECT = (0.0, 0.0, 1.0, 1.0)
 
     def __init__(self, set_rectangle: Callable, rows: int, columns: int):
         self._set_rectangle: Callable = set_rectangle
@@ -192,19 +227,26 @@ class ImageGrid:
 
         self._cell_height: float = 1 / rows
         self._cell_height_margin: float = self._cell_height * ImageGrid.MARGIN_PERCENT
+        # Cell geometry never changes after construction, so all rectangles are
+        # built in one vectorized pass and looked up by id.  float32 matches
+        # what the canvas stores the normalized ROI as anyway.
+        ids = np.arange(rows * columns)
+        row_idx = ids // columns
+        column_idx = ids % columns
+        start_width = np.clip(self._cell_width * column_idx - self._cell_width_margin, 0, 1)
+        start_height = np.clip(self._cell_height * row_idx - self._cell_height_margin, 0, 1)
+        end_width = np.clip(self._cell_width * (column_idx + 1) + self._cell_width_margin, 0, 1)
+        end_height = np.clip(self._cell_height * (row_idx + 1) + self._cell_height_margin, 0, 1)
+        self._rects: np.ndarray = np.stack([start_width, start_height, end_width, end_height], axis=1).astype(
+            np.float32
+        )
 
-    def normalized_rectangle(self, id: int) -> List[float]:
-        row: int = id // self._columns
-        column: int = id % self._columns
-        start_width = max(float(0), self._cell_width * column - self._cell_width_margin)
-        start_height = max(float(0), self._cell_height * row - self._cell_height_margin)
-        end_width = min(float(1), self._cell_width * (column + 1) + self._cell_width_margin)
-        end_height = min(float(1), self._cell_height * (row + 1) + self._cell_height_margin)
-        return [start_width, start_height, end_width, end_height]
+    def normalized_rectangle(self, id: int) -> np.ndarray:
+        return self._rects[id]
 
     def set_rectangle(self, set_limits: bool, id: int) -> None:
         if set_limits:
             self._set_rectangle(self.normalized_rectangle(id))
         else:
             # no limits
-            self._set_rectangle([0, 0, 1, 1])
+            self._set_rectangle(ImageGrid.FULL_RECT)
@@ -1099,6 +1099,12 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
         self._layers_certified: Dict[str:bool] = {}
         self._layers_hard_example: Dict[str:bool] = {}
 
+        """The same flags as layer-index-aligned bool arrays, kept in sync in place,
+        so per-event filter checks are one vectorized scan instead of dict iteration."""
+        self._layer_indexes: Dict[str, int] = {layer: index for index, layer in enumerate(self._layers)}
+        self._layers_has_mask_bits: np.ndarray = np.zeros(len(self._layers), dtype=np.bool_)
+        self._layers_certified_bits: np.ndarray = np.zeros(len(self._layers), dtype=np.bool_)
+
         # Status checkboxes
         self.layers_status_checkboxes = {status: {} for status in LayersStatus}
 
@@ -1233,6 +1239,19 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
     def layers_hard_example(self) -> Dict[str, bool]:
         return self._layers_hard_example
 
+    @property
+    def layers_has_mask_bits(self) -> np.ndarray:
+        return self._layers_has_mask_bits
+
+    @property
+    def layers_certified_bits(self) -> np.ndarray:
+        return self._layers_certified_bits
+
+    def _refresh_layer_bits(self):
+        for layer, index in self._layer_indexes.items():
+            self._layers_has_mask_bits[index] = self._layers_has_mask.get(layer, False)
+            self._layers_certified_bits[index] = self._layers_certified.get(layer, False)
+
     def set_layer(self, layer):
         self._current_layer = layer
         self.ic.set_layer(layer, self.update_layer_information)
@@ -1289,6 +1308,7 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
         self.ic.set_layer_certified(layer, checked)
 
         self._layers_certified[layer] = checked
+        self._layers_certified_bits[self._layer_indexes[layer]] = checked
 
         if layer == self._current_layer:
             self.certified = checked
@@ -1549,13 +1569,14 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
             self.grid_size = new_grid_size
 
     def update_layers_status(self):
-        self.ic.update_certification_layers(
-            self.layers_status_checkboxes[LayersStatus.CERTIFICATION], self._layers_certified
-        )
-        self.ic.update_hard_example_layers(
-            self.layers_status_checkboxes[LayersStatus.HARD_EXAMPLE], self._layers_hard_example
+        self.ic.update_certification_and_hard_example_layers(
+            self.layers_status_checkboxes[LayersStatus.CERTIFICATION],
+            self._layers_certified,
+            self.layers_status_checkboxes[LayersStatus.HARD_EXAMPLE],
+            self._layers_hard_example,
         )
         self.ic.update_has_mask_layers(self._layers_has_mask)
+        self._refresh_layer_bits()
 
     def navigate_to_image_by_search(self, image_ref):
         try:
@@ -1594,24 +1615,11 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
     def navigate_to_image(self, human_index):
         index = human_index - 1
         if self.skip_image(index):
-            current_prev_index = index
-            current_next_index = index
-            while True:
-                if current_prev_index != 0:
-                    current_prev_index, skip_image = self.prev_valid_image(current_prev_index, index)
-                    if not skip_image:
-                        self.current_image_index = current_prev_index
-                        break
-
-                if current_next_index != len(self._images) - 1:
-                    current_next_index, skip_image = self.next_valid_image(current_next_index, index)
-                    if not skip_image:
-                        self.current_image_index = current_next_index
-                        break
-
-                if current_prev_index == 0 and current_next_index == len(self._images) - 1:
-                    break
-
+            """Nearest valid image; on ties the previous one wins, as before.
+            If every image is filtered out the current image stays put."""
+            valid_indexes = np.flatnonzero(np.logical_not(self.skip_mask()))
+            if valid_indexes.size > 0:
+                self.current_image_index = int(valid_indexes[np.abs(valid_indexes - index).argmin()])
             self.navigation_slider.setValue(self.current_image_index + 1)
         else:
             self.current_image_index = index
@@ -1622,6 +1630,7 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
         if self._layers_has_mask[layer] == has_mask:
             return
         self._layers_has_mask[layer] = has_mask
+        self._layers_has_mask_bits[self._layer_indexes[layer]] = has_mask
         for filter_ui in self.filters.values():
             filter_ui.update_image_value(
                 self,
@@ -1632,7 +1641,16 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
         if original_position is not None and current_index == original_position:
             return False
 
-        return any([filter_ui.skip_image(current_index) for filter_ui in self.filters.values()])
+        return any(filter_ui.skip_image(current_index) for filter_ui in self.filters.values())
+
+    def skip_mask(self):
+        """Skip flags for all images combined over the filters in one vectorized pass."""
+        mask = np.zeros(len(self._images), dtype=np.bool_)
+        for filter_ui in self.filters.values():
+            filter_mask = filter_ui.skip_mask()
+            if filter_mask is not None:
+                np.logical_or(mask, filter_mask, out=mask)
+        return mask
 
     def next_valid_image(self, current_index, original_position):
         current_index += 1
@@ -1760,7 +1778,7 @@ class MainWindow(QMainWindow, MainWindowSubject, metaclass=MainWindowMeta):
 
         try:
             if mask is not None:
-                mask = np.asarray(body["mask"]).astype(np.bool)
+                mask = np.asarray(body["mask"]).astype(np.bool_)
                 self.ic.img._set_mask(mask)
                 self.ic.img._update_mask()
                 self.ic._draw_current()
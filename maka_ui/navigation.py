@@ -17,7 +17,7 @@
 
 from PyQt5.QtWidgets import QSlider
 from PyQt5.QtGui import QPainter, QPen, QBrush
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from abstractions.filters import FilterObserver, FilterSubject
 
 
@@ -32,20 +32,32 @@ class NavigationSlider(QSlider, FilterObserver, metaclass=NavigationSliderMeta):
         self.images = {}
         self.draw_mode = {}
         self.colors = {}
+        self._update_pending = False
+
+    def _schedule_update(self):
+        """Filters fire several updates back to back when their caches rebuild;
+        collapse them into one repaint on the next event-loop turn."""
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._flush_update)
+
+    def _flush_update(self):
+        self._update_pending = False
+        self.update()
 
     def images_update(self, subject: FilterSubject):
         self.images[subject.name] = subject.images.copy()
-        self.update()
+        self._schedule_update()
 
     def image_update(self, subject: FilterSubject, index: int, value: bool):
         if self.images[subject.name][index] != value:
             self.images[subject.name][index] = value
-            self.update()
+            self._schedule_update()
 
     def mode_update(self, subject: FilterSubject):
         self.draw_mode[subject.name] = subject.active
         self.colors[subject.name] = subject.color
-        self.update()
+        self._schedule_update()
 
     def paint_over_unavailable_regions(self, filter_name):
         painter = QPainter()
@@ -19,14 +19,9 @@ import datetime
 import os
 
 import cv2
-import matplotlib
 import numpy as np
 from aenum import AutoNumberEnum
-from matplotlib import pyplot as plt
-from matplotlib.patches import Polygon
-from PIL import Image, ImageEnhance
-from skimage import morphology
-from skimage.segmentation import flood_fill
+from PIL import Image, ImageDraw, ImageEnhance
 from typing import List, Tuple
 
 import torchscript_model
@@ -39,13 +34,14 @@ from foreground_background_detection import (
 from metadata import CertificationData, DEFAULT_CERTIFICATION_VERSION, DEFAULT_CERTIFICATION_SOURCE
 from utils import decode_color, make_texture
 
-matplotlib.use("agg")
-
 GRID_ROWS = 4
 GRID_COLUMNS = 3
 
 MASK_UNDO_STACK_LEN = 100
 SAVE_ALWAYS = True
+# Masks above this many pixels go through the T-API, so morphology runs on an
+# OpenCL device when one exists; below it the upload costs more than it saves.
+UMAT_PIXELS_THRESHOLD = 4 * 1024 * 1024
 DEFAULT_MASK_COLOR = [255, 0, 0]
 POLYGON_LINE_ERASER_COLOR = [0, 0, 0]
 
@@ -92,25 +88,57 @@ def create_hsv_mask(img, minh=0, maxh=255, mins=0, maxs=255, minv=0, maxv=255):
     return create_mask(img, mina=minh, maxa=maxh, minb=mins, maxb=maxs, minc=minv, maxc=maxv)
 
 
+def pack_mask(mask):
+    """Bit-pack a bool mask row-wise, 8 pixels per byte.
+
+    Rows whose width is not a multiple of 8 are zero-padded to the next byte;
+    unpack_mask trims the padding back off with the stored width.
+    """
+    return np.packbits(mask, axis=1)
+
+
+def unpack_mask(packed, shape):
+    # 0/1 uint8 straight from unpackbits; bitwise ops downstream treat it the
+    # same as bool without another view or cast.
+    _, width = shape
+    return np.unpackbits(packed, axis=1, count=width)
+
+
 def apply_multiple_masks(colors_masks, outimg, mask_opacity):
-    for color, mask in colors_masks:
-        apply_mask(outimg, mask, mask_opacity, color)
+    colors, packed_stack, shape = colors_masks
+    if not colors:
+        return
+    for color, packed in zip(colors, packed_stack):
+        apply_mask(outimg, unpack_mask(packed, shape), mask_opacity, color)
 
 
 def apply_mask(outimg, mask, mask_opacity, color):
-    outimg_before = outimg.copy()
-    # save contours to be able to draw an outline
-    contours = cv2.findContours(mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
-    # make texture
+    # Restrict the copy, contour trace and blend to the mask's bounding box;
+    # sparse layers then cost proportionally to their extent, not the image.
+    mask_rows = np.flatnonzero(mask.any(axis=1))
+    if mask_rows.size == 0:
+        return
+    mask_cols = np.flatnonzero(mask.any(axis=0))
+    y_start, y_end = mask_rows[0], mask_rows[-1] + 1
+    x_start, x_end = mask_cols[0], mask_cols[-1] + 1
+
+    sub_mask = mask[y_start:y_end, x_start:x_end]
+    sub_img = outimg[y_start:y_end, x_start:x_end].copy()
+    sub_img_before = sub_img.copy()
+    # save contours to be able to draw an outline; the view avoids a
+    # crop-sized copy and findContours does not modify its input
+    contours = cv2.findContours(sub_mask.view(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    # make texture; slice the full-size pattern so its phase stays put
     rgb_color, texture_id = decode_color(color)
-    texture = make_texture((mask.shape[0], mask.shape[1]), texture_id)
-    mask = mask & texture
-    # apply texture to the image
-    outimg[mask] = rgb_color
+    texture = make_texture((mask.shape[0], mask.shape[1]), texture_id)[y_start:y_end, x_start:x_end]
+    sub_mask = sub_mask & texture
+    # apply texture to the image (bool view so uint8 masks index, not gather)
+    sub_img[sub_mask.view(np.bool_)] = rgb_color
     # draw contours on top of texture
-    cv2.drawContours(outimg, contours, -1, rgb_color, thickness=1)
+    cv2.drawContours(sub_img, contours, -1, rgb_color, thickness=1)
     # combine original image with weighted image
-    cv2.addWeighted(outimg, mask_opacity, outimg_before, 1 - mask_opacity, 0, outimg)
+    cv2.addWeighted(sub_img, mask_opacity, sub_img_before, 1 - mask_opacity, 0, sub_img)
+    outimg[y_start:y_end, x_start:x_end] = sub_img
 
 
 def image_apply_mask(
@@ -149,6 +177,16 @@ def image_apply_mask(
         cv2.line(outimg, tuple(cur_line_start), tuple(cur_line_end), polygon_line_color, 1)
 
 
+def filter_src(mask):
+    if mask.size > UMAT_PIXELS_THRESHOLD:
+        return cv2.UMat(mask)
+    return mask
+
+
+def filter_result(mask):
+    return mask.get() if isinstance(mask, cv2.UMat) else mask
+
+
 def mask_image_from_image(outimg, mask, x, xlen, y, ylen):
     if x is not None and xlen is not None and y is not None and ylen is not None:
         outimg[y : y + ylen, x : x + xlen] = 0
@@ -375,7 +413,7 @@ class MaskImage:
         self.undo_stack = []
         self.seed_mask = np.zeros(img.shape[:2], dtype="uint8")
         self.mask_stack_top = 0
-        self._initial_mask = np.zeros(img.shape[:2], dtype=np.bool)
+        self._initial_mask = np.zeros(img.shape[:2], dtype=np.bool_)
         # Second element means algorithm
         self.mask_stack.append((self._initial_mask, None, None))
         self.visible_area = None
@@ -392,6 +430,7 @@ class MaskImage:
         self.polygon_lines_origin = []
         self.polygon_lines_origin_prev = []
         self.polygon_line_color = mask_color
+        self._polygon_buffer = None
 
         # Layering
         self.layer = layer
@@ -427,6 +466,11 @@ class MaskImage:
         self.image_has_mask_callback = image_has_mask_callback
         self.update_layer_has_mask = update_layer_has_mask
         self._manual_mask_update = False
+        # Cached result of mask().any(); a full mask scan is bandwidth-bound and the
+        # answer only changes when the mask does.
+        self._mask_any = None
+        # Bumped on every recomposite so the canvas can cache derived pixmaps.
+        self.generation = 0
 
         self.show_all_layers = show_all_layers
         self.other_layers_colors_masks = other_layers_masks
@@ -466,6 +510,45 @@ class MaskImage:
     def _is_mask_modified(self):
         return not np.array_equal(self._initial_mask, self.mask())
 
+    def switch_layer(self, layer, colors_masks, mask_color, image_has_mask_callback):
+        """Rebind per-layer state and load the new layer's mask in place.
+
+        The tone-mapped image, depth and ROI depend only on pixels, so a layer
+        switch resets the mask, undo and polyshape state instead of rebuilding
+        the whole object and re-running apply_settings.
+        """
+        self.layer = layer
+        self.image_has_mask_callback = image_has_mask_callback
+
+        self.mask_stack = []
+        self.boxes_stack = []
+        self.seeds_stack = []
+        self.undo_stack = []
+        self.seed_mask = np.zeros(self.origin_img.shape[:2], dtype="uint8")
+        self.mask_stack_top = 0
+        self._initial_mask = np.zeros(self.origin_img.shape[:2], dtype=np.bool_)
+        self.mask_stack.append((self._initial_mask, None, None))
+
+        self.polygon_lines = []
+        self.polygon_lines_prev = []
+        self.polygon_lines_origin = []
+        self.polygon_lines_origin_prev = []
+        self.polygon_line_color = mask_color
+        self.hidden_shapes = []
+
+        self.destination_layer_file = None
+        self.last_destination_mask = None
+
+        self._mask_certified = False
+        self._hard_example = False
+        self._manual_mask_update = False
+        self._mask_any = None
+
+        self.other_layers_colors_masks = colors_masks
+        self.mask_color = mask_color
+        self.create_all_layers_mask()
+        self.load_image_mask(MaskImage.make_label_filename(self.label_path, self.image_filename, self.layer))
+
     def load_image_mask(self, label_file):
         self._initial_mask = load_mask(label_file, self.mask())
         self._update_mask()
@@ -493,7 +576,7 @@ class MaskImage:
 
         x, y, x_end, y_end = self.boxes_stack[-1]
         mask[y:y_end, x:x_end] = current_mask[y:y_end, x:x_end]
-        current_mask[y:y_end, x:x_end] = np.zeros((y_end - y, x_end - x)).astype(np.bool)
+        current_mask[y:y_end, x:x_end] = np.zeros((y_end - y, x_end - x), dtype=np.bool_)
 
         self.create_destination_layer_file()
         md5sum = CertificationData.calculate_md5sum(self.destination_layer_file)
@@ -507,7 +590,7 @@ class MaskImage:
         self.boxes_stack = []
         self._set_mask(current_mask)
 
-        self._manual_mask_update = True
+        self._mark_mask_changed()
         self.update_other_layers_masks_callback()
         self._update_mask()
 
@@ -521,7 +604,7 @@ class MaskImage:
                 self.update_layer_has_mask(layer=self.destination_layer, has_mask=(new_md5sum is not None))
             self.undo_stack.pop()
             self.last_destination_mask = None
-            self._manual_mask_update = True
+            self._mark_mask_changed()
             self.update_other_layers_masks_callback()
 
     def update_destination_layer_certification_data(self, md5sum):
@@ -550,6 +633,10 @@ class MaskImage:
             if algo in MaskImage.ALGORITHMS_STACK
         ]
 
+    def _mark_mask_changed(self):
+        self._manual_mask_update = True
+        self._mask_any = None
+
     def _set_mask(self, mask, algorithm=None, value=None):
         if len(self.mask_stack) >= MASK_UNDO_STACK_LEN:
             self.mask_stack = self.mask_stack[1:]
@@ -558,20 +645,29 @@ class MaskImage:
         self.mask_stack.append((mask, algorithm, value))
         self.undo_stack.append(self.Action.MASK_MODE)
         self.mask_stack_top += 1
-        self._manual_mask_update = True
+        self._mark_mask_changed()
 
     def mask(self, algorithm=None):
         if algorithm is not None and self.mask_stack[self.mask_stack_top][1] == algorithm:
             self.undo_mask_image()
-            self._manual_mask_update = True
+            self._mark_mask_changed()
         return self.mask_stack[self.mask_stack_top][0]
 
+    def mask_any(self):
+        """Whether any pixel of the current mask is set, cached between mask edits."""
+        if self._mask_any is None:
+            self._mask_any = bool(self.mask().any())
+        return self._mask_any
+
     def generate_grab_cut_with_rectangle(self):
         if len(self.boxes_stack) > 0:
             x, y, x_end, y_end = self.boxes_stack[-1]
             w, h = x_end - x, y_end - y
             # Chopping image and assigning some of it to background.
-            bg_window_size = 50
+            # ~20% of the box as background margin: small boxes no longer pay for a
+            # fixed 50px border (GrabCut's max-flow cost is near-linear in crop pixels),
+            # large boxes keep the old cap.
+            bg_window_size = min(50, max(10, max(w, h) // 5))
             x_image_begin = np.maximum(y - bg_window_size, 0)
             x_image_end = np.minimum(y_end + bg_window_size, self._img.shape[0])
             y_image_begin = np.maximum(x - bg_window_size, 0)
@@ -663,48 +759,54 @@ class MaskImage:
     def apply_dilation(self, dilation_iterations):
         def dilation(mask):
             se = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-            result_mask = cv2.dilate(mask, kernel=se, iterations=dilation_iterations)
+            result_mask = cv2.dilate(filter_src(mask), kernel=se, iterations=dilation_iterations)
             # Rotating because dilation works only from top and left sides of the image.
-            result_mask = np.rot90(result_mask, 2)
+            # cv2.rotate stays contiguous; the np.rot90 view made dilate copy internally.
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
             result_mask = cv2.dilate(result_mask, kernel=se, iterations=dilation_iterations)
-            result_mask = np.rot90(result_mask, 2)
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
 
-            return result_mask
+            return filter_result(result_mask)
 
         self.apply_filter(MaskImage.Algorithm.DILATION, dilation, dilation_iterations)
 
     def apply_erosion(self, erosion_iterations):
         def erosion(mask):
             se = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-            result_mask = cv2.erode(mask, kernel=se, iterations=erosion_iterations)
+            result_mask = cv2.erode(filter_src(mask), kernel=se, iterations=erosion_iterations)
             # Rotating because erosion works only from top and left sides of the image.
-            result_mask = np.rot90(result_mask, 2)
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
             result_mask = cv2.erode(result_mask, kernel=se, iterations=erosion_iterations)
-            result_mask = np.rot90(result_mask, 2)
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
 
-            return result_mask
+            return filter_result(result_mask)
 
         self.apply_filter(MaskImage.Algorithm.EROSION, erosion, erosion_iterations)
 
     def apply_removing_objects(self, removing_objects_size):
         def removing_objects(mask):
-            mask = mask.astype("bool")
-            result_mask = morphology.remove_small_objects(mask, removing_objects_size, connectivity=2).astype("uint8")
+            # connectedComponents + a bincount keep-table does what
+            # morphology.remove_small_objects did without its intermediate bool
+            # copies; connectivity=8 matches the old connectivity=2.
+            _, labels = cv2.connectedComponents(mask, connectivity=8)
+            counts = np.bincount(labels.ravel())
+            keep = (counts >= removing_objects_size).astype("uint8")
+            keep[0] = 0
 
-            return result_mask
+            return keep[labels]
 
         self.apply_filter(MaskImage.Algorithm.REMOVING_OBJECTS, removing_objects, removing_objects_size)
 
     def apply_closing_iterations(self, closing_iterations):
         def closing_iterations_operation(mask):
             se = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-            result_mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel=se, iterations=closing_iterations)
+            result_mask = cv2.morphologyEx(filter_src(mask), cv2.MORPH_CLOSE, kernel=se, iterations=closing_iterations)
             # Rotating because closing works only from top and left sides of the image.
-            result_mask = np.rot90(result_mask, 2)
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
             result_mask = cv2.morphologyEx(result_mask, cv2.MORPH_CLOSE, kernel=se, iterations=closing_iterations)
-            result_mask = np.rot90(result_mask, 2)
+            result_mask = cv2.rotate(result_mask, cv2.ROTATE_180)
 
-            return result_mask
+            return filter_result(result_mask)
 
         self.apply_filter(MaskImage.Algorithm.CLOSING_ITERATIONS, closing_iterations_operation, closing_iterations)
 
@@ -785,11 +887,17 @@ class MaskImage:
             return self._img.shape[2]
         return 1
 
-    def get_display_hsv(self):
-        return cv2.cvtColor(self._display, cv2.COLOR_RGB2HSV_FULL)
+    def get_display_pixel_colors(self, x, y):
+        """RGB, HSV and LAB values of one display pixel.
 
-    def get_display_lab(self):
-        return cv2.cvtColor(self._display, cv2.COLOR_RGB2Lab)
+        Converting the single pixel is O(1) per mouse move; caching converted
+        HSV/LAB planes cost two full visible-region passes after every display
+        update, which during brush drags is every stroke.
+        """
+        pixel = self._display[y : y + 1, x : x + 1]
+        hsv = cv2.cvtColor(pixel, cv2.COLOR_RGB2HSV_FULL)[0, 0]
+        lab = cv2.cvtColor(pixel, cv2.COLOR_RGB2Lab)[0, 0]
+        return pixel[0, 0], hsv, lab
 
     def get_display_rgb(self):
         return self._display
@@ -812,7 +920,18 @@ class MaskImage:
             img = self._img[y_start:y_end, x_start:x_end, :]
 
         img = self.add_glowing_borders(img)
-        self._display = cv2.resize(img, dsize=None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        scale = self.scale
+        # Walk a pyrDown pyramid toward strong reductions: each level is a cheap
+        # separable Gaussian half-size, so zoomed-out views cost far less than one
+        # big INTER_AREA resize.  A persistent per-image pyramid is not worth the
+        # bookkeeping here because the composited image changes with every mask
+        # edit; the residual factor stays in (0.5, 1] and is resized normally.
+        while scale <= 0.5 and min(img.shape[:2]) > 1:
+            img = cv2.pyrDown(img)
+            scale *= 2
+        if scale != 1.0:
+            img = cv2.resize(img, dsize=None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        self._display = img
 
         return self._display.astype("uint8")
 
@@ -822,8 +941,11 @@ class MaskImage:
         return (cv2.cvtColor(self.depth, cv2.COLOR_GRAY2RGB) % contour) * scale
 
     def _update_mask(self, x=None, xlen=None, y=None, ylen=None):
+        # Every mutating path recomposites through here; the counter lets the
+        # canvas tell whether its cached visible pixmap is still current.
+        self.generation += 1
         if self._manual_mask_update:
-            self.image_has_mask_callback(self.mask().any())
+            self.image_has_mask_callback(self.mask_any())
             self._manual_mask_update = False
 
         img = None
@@ -873,7 +995,7 @@ class MaskImage:
 
     def find_inch_grid(self):
         adjusted_ppi = int(self.ppi_value / 4) * 4
-        self.inch_grid = np.zeros(self._img.shape[:2], dtype=np.bool)
+        self.inch_grid = np.zeros(self._img.shape[:2], dtype=np.bool_)
         self.inch_grid[:, :: adjusted_ppi] = True
         self.inch_grid[:: adjusted_ppi] = True
         # add quarter inch grid
@@ -948,18 +1070,20 @@ class MaskImage:
         return self._roi_end[0] - self._roi_start[0]
 
     def set_roi(self, roi: List[float]):
-        start_width, start_height, end_width, end_height = roi
+        height, width = self._img.shape[:2]
+        scaled = np.asarray(roi, dtype=np.float32) * np.array([width, height, width, height], dtype=np.float32)
+        start_width, start_height, end_width, end_height = scaled.astype(int)
 
-        self._roi_start = [int(start_height * self._img.shape[0]), int(start_width * self._img.shape[1])]
-        self._roi_end = [int(end_height * self._img.shape[0]), int(end_width * self._img.shape[1])]
+        self._roi_start = [int(start_height), int(start_width)]
+        self._roi_end = [int(end_height), int(end_width)]
 
     def make_hole(self, radius):
         if self.hole is not None and self.last_hole_radius == radius:
             return
-        yy, xx = np.mgrid[: radius * 2, : radius * 2]
-        circle = (xx - radius) ** 2 + (yy - radius) ** 2
-        hole = circle > (radius * radius)
-        self.hole = hole.astype(np.bool)
+        # ogrid's open grids broadcast to the circle without materializing two
+        # full (2r, 2r) coordinate arrays the way mgrid did.
+        yy, xx = np.ogrid[: radius * 2, : radius * 2]
+        self.hole = (xx - radius) ** 2 + (yy - radius) ** 2 > (radius * radius)
         self.last_hole_radius = radius
 
     def _draw_xy(self, x, y, radius):
@@ -1021,18 +1145,22 @@ class MaskImage:
     def mask_draw(self, x, y, radius):
         self.mask_draw_erase(x, y, radius, self.mask().copy(), np.logical_or, np.logical_not)
 
-    def line_roi(self, start_point, end_point, radius=5):
-        start_x, start_y = start_point
-        end_x, end_y = end_point
+    def points_roi(self, points, radius=5):
+        """Bounding box of a point set padded by radius, as (x, xlen, y, ylen)."""
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
 
-        x_min = max(min(start_x, end_x) - radius, 0)
-        x_max = min(max(start_x, end_x) + radius, self._img.shape[1])
+        x_min = max(min(xs) - radius, 0)
+        x_max = min(max(xs) + radius, self._img.shape[1])
 
-        y_min = max(min(start_y, end_y) - radius, 0)
-        y_max = min(max(start_y, end_y) + radius, self._img.shape[0])
+        y_min = max(min(ys) - radius, 0)
+        y_max = min(max(ys) + radius, self._img.shape[0])
 
         return x_min, x_max - x_min, y_min, y_max - y_min
 
+    def line_roi(self, start_point, end_point, radius=5):
+        return self.points_roi([start_point, end_point], radius)
+
     def draw_erase_line(self, prev_point, cur_point, radius, np_ones_zeros, np_logical_or_and, color, set_mask=False):
         x_start, y_start = prev_point
         prev_point = self.convert_to_limits(x_start, y_start)
@@ -1044,14 +1172,19 @@ class MaskImage:
         if set_mask:
             mask = mask.copy()
 
-        tmpmask = np_ones_zeros(mask.shape, dtype=np.uint8)
-        cv2.line(tmpmask, prev_point, cur_point, color, 2 * radius)
-        np_logical_or_and(tmpmask, mask, mask)
+        # Stamp the segment inside its ROI only; a full-image scratch mask per
+        # mouse-move segment made brush latency scale with image size.
+        tmpmask = np_ones_zeros((ylen, xlen), dtype=np.uint8)
+        start = (prev_point[0] - x, prev_point[1] - y)
+        end = (cur_point[0] - x, cur_point[1] - y)
+        cv2.line(tmpmask, start, end, color, 2 * radius)
+        mask_roi = mask[y : y + ylen, x : x + xlen]
+        np_logical_or_and(tmpmask, mask_roi, mask_roi)
 
         if set_mask:
             self._set_mask(mask)
 
-        self._manual_mask_update = True
+        self._mark_mask_changed()
         self._update_mask(x=x, xlen=xlen, y=y, ylen=ylen)
 
     def draw_line(self, prev_point, cur_point, radius, set_mask=False):
@@ -1062,31 +1195,33 @@ class MaskImage:
 
     def flood_fill(self, x, y):
         x, y = self.convert_to_limits(x, y)
-        tmpmask = np.zeros_like(self.mask().copy()).astype("uint8")
+        tmpmask = np.zeros_like(self.mask()).astype("uint8")
         tmpmask[self.mask()] = 255
-        mask = tmpmask.copy()
 
-        mask = flood_fill(mask, (y, x), 255)
-        self._set_mask(mask == 255)
-        self._update_mask()
+        # cv2.floodFill runs the scanline fill in C and hands back the bounding
+        # rect of what it touched, so the recomposite needs no mask diffing.
+        # flags=8 keeps the 8-connectivity that skimage's flood_fill used.
+        _, tmpmask, _, rect = cv2.floodFill(tmpmask, None, (x, y), 255, flags=8)
+        self._set_mask(tmpmask == 255)
+        rect_x, rect_y, rect_w, rect_h = rect
+        if rect_w > 0 and rect_h > 0:
+            self._update_mask(x=rect_x, xlen=rect_w, y=rect_y, ylen=rect_h)
+        else:
+            self._update_mask()
 
     def make_polygon_mask(self, points):
-        fig = plt.figure(0, figsize=self.mask().shape[::-1], dpi=1)
-        plt.axis("off")
-        plt.axis("image")
-        plt.axis([0, self.mask().shape[1], self.mask().shape[0], 0])
-        ax = plt.gca()
-        ax.add_artist(Polygon(points, color="black", fill=True))
-        fig.tight_layout(pad=0)
-        fig.canvas.draw()
-        canvas_bytes = fig.canvas.tostring_rgb()
-        canvas_shape = fig.canvas.get_width_height()[::-1]
-        plt.close(fig)
-
-        data = np.frombuffer(canvas_bytes, dtype=np.uint8)
-        data = data.reshape(canvas_shape + (3,))
-        # Mask even slightly non-white pixels to support having very thin leaves
-        return data[..., 0] < 255
+        # PIL's scanline fill rasterizes straight into a single-channel buffer; the
+        # old matplotlib path rendered a full RGB figure canvas per polygon.
+        # The buffer is kept across polygons so repeated fills reuse one allocation.
+        size = self.mask().shape[::-1]
+        if self._polygon_buffer is None or self._polygon_buffer.size != size:
+            self._polygon_buffer = Image.new("L", size, 0)
+        else:
+            self._polygon_buffer.paste(0, (0, 0) + size)
+        draw = ImageDraw.Draw(self._polygon_buffer)
+        # Draw the outline too so very thin shapes still cover at least their edges.
+        draw.polygon([tuple(point) for point in points], fill=1, outline=1)
+        return np.asarray(self._polygon_buffer, dtype=np.bool_)
 
     def fill_polygon(self, mode):
         points = []
@@ -1106,7 +1241,9 @@ class MaskImage:
         self.polygon_lines_prev = self.polygon_lines
         self.polygon_lines_origin = []
         self.polygon_lines = []
-        self._update_mask()
+        # The polygon and its outline lines only ever touched their bounding box.
+        x, xlen, y, ylen = self.points_roi(points)
+        self._update_mask(x=x, xlen=xlen, y=y, ylen=ylen)
 
     def reset_polygon_data(self):
         self.polygon_lines = []
@@ -1181,7 +1318,9 @@ class MaskImage:
             self.polygon_line_color = POLYGON_LINE_ERASER_COLOR
 
         self.undo_stack.append(mode)
-        self._update_mask()
+        # Only the freshly appended line needs compositing.
+        x, xlen, y, ylen = self.line_roi((x_start, y_start), (x_end, y_end))
+        self._update_mask(x=x, xlen=xlen, y=y, ylen=ylen)
 
     def undo_polygon_line(self, display_previous_polygon=False):
         if display_previous_polygon is True:
@@ -1213,10 +1352,14 @@ class MaskImage:
         self.boxes_stack.append((x_start, y_start, x_end, y_end))
 
         if mode == self.Action.MASK_MOVE:
+            # move_mask already recomposited the source and destination regions.
             self.move_mask()
+            self.undo_stack.append(mode)
+            return
         self.undo_stack.append(mode)
 
-        self._update_mask()
+        x, xlen, y, ylen = self.line_roi((x_start, y_start), (x_end, y_end))
+        self._update_mask(x=x, xlen=xlen, y=y, ylen=ylen)
 
     def undo_last_seed_image(self):
         if len(self.seeds_stack) > 0:
@@ -1244,12 +1387,12 @@ class MaskImage:
         self.make_hole(radius)
 
         hole_part = self.hole[holey_start : holey_start + ylen, holex_start : holex_start + xlen]
-        self.seed_mask[y : y + ylen, x : x + xlen][hole_part == 0] = 1
+        self.seed_mask[y : y + ylen, x : x + xlen][np.logical_not(hole_part)] = 1
 
         self.seeds_stack.append((x, y, xlen, ylen))
         self.undo_stack.append(self.Action.SEED_MODE)
 
-        self._update_mask()
+        self._update_mask(x=x, xlen=xlen, y=y, ylen=ylen)
 
     def undo_last_operation_image(self):
         if len(self.undo_stack) > 0:
@@ -1285,5 +1428,5 @@ class MaskImage:
         if self.mask_stack_top > 0:
             self.mask_stack_top -= 1
             self.undo_stack.pop(index_of_elements_last_occurrence(self.undo_stack, self.Action.MASK_MODE))
-            self._manual_mask_update = True
+            self._mark_mask_changed()
             self._update_mask()
@@ -151,6 +151,8 @@ class DirectoryMetadata:
 
 
 class CertificationData:
+    __slots__ = ("_version", "_certified", "_username", "_source", "_timestamp", "_md5sum", "_hard_example")
+
     def __init__(
         self,
         version=1,
@@ -185,10 +187,6 @@ class CertificationData:
     def source(self):
         return self._source
 
-    @property
-    def md5sum(self):
-        return self._md5sum
-
     def modify(self, certified, mask_modified, hard_example):
         return self._certified != certified or mask_modified or self._hard_example != hard_example
 
@@ -240,13 +238,16 @@ class CertificationData:
 
     @staticmethod
     def load(filepath):
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r") as f:
-                    config = json.load(f)
-                    return CertificationData.from_json(config)
-            except Exception as e:
-                print("certification file load failure:", e)
+        # Open directly instead of probing first; the exists() stat doubled the
+        # syscall count for these per-layer files.
+        try:
+            with open(filepath, "r") as f:
+                config = json.load(f)
+                return CertificationData.from_json(config)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print("certification file load failure:", e)
         return CertificationData()
 
     @staticmethod
@@ -22,7 +22,7 @@ import subprocess
 import cv2
 import numpy as np
 
-import boto3
+import file_io
 
 _dir_re = re.compile("\s*PRE\s(.*)$")  # noqa
 _file_re = re.compile("[\d-]*\s*[\d:]*\s*\d*\s*(.*)$")  # noqa
@@ -100,17 +100,9 @@ def get_file_listing(path):
 
 def get_file_image_data(metadata, path, filename):
     """Returns the full data of the file requested under path."""
-    parts = path.split("/")
-    bucket = parts[0]
-    path = "/".join(parts[1:] + [filename])
-    s3 = boto3.resource("s3")
-    bucket = s3.Bucket(bucket)
-    objects = bucket.objects.filter(Prefix=path)
-    objects = [o for o in objects]
-    if len(objects) == 0:
+    data = file_io.read_file(file_io.S3_PREFIX + path + "/" + filename)
+    if data is None:
         return None
-    object = objects[0]
-    data = object.get()["Body"].read()
 
     if filename.endswith(".npz"):
         image_meta = metadata.get_image_metadata(filename)
@@ -16,6 +16,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from datetime import datetime
+import functools
 import math
 import os
 from typing import List, Tuple
@@ -73,7 +74,9 @@ def decode_color(color: List[int]) -> Tuple[Tuple[int, int, int], int]:
         return rgb_color, 0
 
 
+@functools.lru_cache(maxsize=8)
 def make_texture(shape: Tuple[int, int], texture_id: int) -> np.ndarray:
+    """Tiled texture pattern for a mask overlay; callers must not mutate the result."""
     if texture_id == 0:
         base = np.ones((1, 1))
 
@@ -133,7 +136,7 @@ def make_texture(shape: Tuple[int, int], texture_id: int) -> np.ndarray:
     else:
         raise ValueError(f"Unknown texture: {texture_id}")
 
-    return np.tile(base.astype(np.bool), (math.ceil(shape[0] / base.shape[0]), math.ceil(shape[1] / base.shape[1])))[
+    return np.tile(base.astype(np.bool_), (math.ceil(shape[0] / base.shape[0]), math.ceil(shape[1] / base.shape[1])))[
         : shape[0], : shape[1]
     ]
 